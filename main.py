@@ -1,95 +1,27 @@
+import time
+_imports_started = time.perf_counter()
+
 from utils.cookies import load_cookies
-from utils.login import login
-from utils.api import (
-    submit_logbook, get_logbook_months, get_logbook_entries, get_entry_for_date,
-    check_month_completion_status, is_month_available_for_submission
-)
-from utils.config import get_credentials
+from utils.api import LogbookSnapshot, probe_session
+from utils.config import get_credentials, get_csv_settings
 from datetime import datetime
-from utils.csv_parser import import_from_csv
-from utils.utils import is_valid_time_format, logger
-from utils.constants import WEEKDAY_SATURDAY, WEEKDAY_SUNDAY
+from utils.csv_parser import import_from_csv, open_csv_stream
+from utils.utils import session_store, logger
+from utils.validation import get_validator
+from utils.constants import WEEKDAY_SUNDAY, IMPORT_TIME_BUDGET, PLAN_CREATE, PLAN_OVERWRITE, PLAN_UNCHANGED, PLAN_BLOCKED, PLAN_SKIP
 from utils.display import (
     print_success, print_error, print_warning, print_info, print_header, 
-    display_csv_entries, display_available_months
+    display_csv_entries, display_available_months, display_submission_plan
 )
+from utils.planner import (
+    build_submission_plan, execute_submission_plan, get_plan_writes, execute_streaming_submission
+)
+from utils.session_refresher import start_session_refresher, stop_session_refresher
+from utils.updates import start_update_check
 import sys
-import os
-import random
-import time
-import requests
-
-LATEST_VERSION_URL_PRIMARY = "https://raw.githubusercontent.com/kangwijen/nullog/refs/heads/main/VERSION"
 
-def _parse_version(version_str):
-    try:
-        parts = version_str.strip().split(".")
-        return tuple(int(p) for p in parts)
-    except Exception:
-        return (0, 0, 0)
-
-def _load_local_version():
-    try:
-        base_dir = os.path.dirname(__file__)
-        version_path = os.path.join(base_dir, "VERSION")
-        if os.path.exists(version_path):
-            with open(version_path, "r", encoding="utf-8") as f:
-                file_version = f.read().strip()
-                parsed = _parse_version(file_version)
-                if parsed != (0, 0, 0):
-                    return file_version
-        return "0.0.0"
-    except Exception:
-        return "0.0.0"
-
-def _fetch_remote_version(url):
-    try:
-        response = requests.get(url, timeout=3)
-        if response.status_code == 200:
-            return response.text.strip()
-        logger.warning(f"Update check failed at {url} with status code: {response.status_code}")
-        return None
-    except requests.exceptions.Timeout:
-        logger.warning(f"Update check timed out for {url}")
-        return None
-    except requests.exceptions.RequestException as e:
-        logger.warning(f"Update check failed for {url}: {str(e)}")
-        return None
-
-def check_for_update():
-    try:
-        logger.info("Checking for software updates")
-        latest_primary = _fetch_remote_version(LATEST_VERSION_URL_PRIMARY)
-
-        latest_version = latest_primary
-        if latest_version:
-            latest_tuple = _parse_version(latest_version)
-            local_version = _load_local_version()
-            current_tuple = _parse_version(local_version)
-
-            if latest_tuple > current_tuple:
-                logger.info(f"New version available: {latest_version}")
-                print_warning(f"A new version ({latest_version}) is available. You are using {local_version}.")
-                print_warning("Please pull the latest version from GitHub.")
-            elif latest_tuple == current_tuple:
-                logger.info("Using latest version")
-                print_success("You are using the latest version.")
-            else:
-                logger.info("Local version is newer than remote VERSION")
-                print_success(f"You are ahead of the remote release (local {local_version} > remote {latest_version}).")
-
-        else:
-            logger.warning("Could not check for updates (all endpoints failed)")
-            print_info("Could not check for updates (network or server error)")
-    except requests.exceptions.Timeout:
-        logger.warning("Update check timed out")
-        print_info("Could not check for updates (timeout)")
-    except requests.exceptions.RequestException as e:
-        logger.warning(f"Update check failed: {str(e)}")
-        print_info("Could not check for updates (network error)")
-    except Exception as e:
-        logger.error(f"Unexpected error during update check: {str(e)}")
-        print_info("Could not check for updates (unexpected error)")
+# Selenium and the rest of the browser stack are imported by utils.login on the first login only
+IMPORT_SECONDS = time.perf_counter() - _imports_started
 
 def validate_date_range(year, month, start, end, current_date):
     try:
@@ -131,12 +63,9 @@ def validate_time_input(time_str, label):
             return False
         
         time_str = time_str.strip()
-        if not time_str:
-            print_error(f"{label} cannot be empty")
-            return False
-        
-        if not is_valid_time_format(time_str):
-            print_error(f"{label} must be in format HH:MM (24-hour) or OFF")
+        error_msg = get_validator().time_error(time_str, label)
+        if error_msg:
+            print_error(error_msg)
             return False
         
         logger.debug(f"Time validation passed for {label}: {time_str}")
@@ -148,12 +77,10 @@ def validate_time_input(time_str, label):
 
 def validate_clock_times(clock_in, clock_out):
     try:
-        if clock_in != "OFF" and clock_out != "OFF":
-            clock_in_hour, clock_in_min = map(int, clock_in.split(':'))
-            clock_out_hour, clock_out_min = map(int, clock_out.split(':'))
-            if (clock_out_hour < clock_in_hour) or (clock_out_hour == clock_in_hour and clock_out_min <= clock_in_min):
-                print_error("Clock out time must be later than clock in time")
-                return False
+        error_msg = get_validator().clock_order_error(clock_in, clock_out)
+        if error_msg:
+            print_error(error_msg)
+            return False
         
         logger.debug(f"Clock time validation passed: {clock_in} - {clock_out}")
         return True
@@ -163,7 +90,7 @@ def validate_clock_times(clock_in, clock_out):
         return False
 
 def get_user_input():
-    current_date = datetime.now()
+    current_date = get_validator().now
     year = current_date.year
     month = current_date.month
     current_day = current_date.day
@@ -282,133 +209,74 @@ def generate_date_range(start_date, end_date, year, month):
         print_error(f"Error generating date range: {str(e)}")
         return [], []
 
-def process_single_day(date, activity, clock_in, clock_out, description, existing_entries, force_overwrite=False):
+def group_entries_by_month(csv_entries):
+    entries_by_month = {}
+    for entry in csv_entries:
+        entries_by_month.setdefault(entry.month_key, []).append(entry)
+    
+    logger.info(f"Grouped entries by month: {len(entries_by_month)} months")
+    return entries_by_month
+
+def process_csv_stream():
     try:
-        logger.info(f"Processing single day entry for {date}")
+        logger.info("Starting streaming CSV processing")
+        stream = open_csv_stream()
         
-        date_obj = datetime.strptime(date, '%Y-%m-%d')
-        weekday = date_obj.weekday()
+        print_warning("Streaming mode: entries are submitted as soon as each row is validated, without a plan preview.")
+        print_warning("Rows should be in date order; a month is blocked while an earlier month is incomplete.")
+        try:
+            print_info("Do you want to continue? (y/n):")
+            if input().strip().lower() != 'y':
+                logger.info("User cancelled streaming CSV processing")
+                print_warning("Operation cancelled by user.")
+                return False
+            
+            print_info("Do you want to force overwrite EXISTING entries without individual confirmation? (y/n):")
+            force_overwrite = input().strip().lower() == 'y'
+        except KeyboardInterrupt:
+            logger.info("User interrupted streaming CSV confirmation")
+            print_warning("\nOperation cancelled by user.")
+            return False
         
-        if weekday == WEEKDAY_SUNDAY:
-            logger.info(f"Skipping Sunday: {date}")
-            print_warning(f"Skipping Sunday: {date}")
-            return
+        logger.info("Retrieving logbook snapshot")
+        snapshot = LogbookSnapshot.fetch()
+        display_available_months(snapshot.completion_status)
         
-        existing_entry = get_entry_for_date(existing_entries, date)
-        if existing_entry:
-            logger.info(f"Found existing entry for {date}")
-            print_info(f"Entry already exists for {date}:")
-            print_info(f"  Activity: {existing_entry['activity']}")
-            print_info(f"  Clock In: {existing_entry['clockIn']}")
-            print_info(f"  Clock Out: {existing_entry['clockOut']}")
-            print_info(f"  Description: {existing_entry['description']}")
-            
-            if not force_overwrite:
-                try:
-                    confirm = input(f"Do you want to overwrite this entry for {date}? (y/n): ").strip().lower()
-                    if confirm != 'y':
-                        logger.info(f"User chose not to overwrite entry for {date}")
-                        print_warning(f"Skipping {date}...")
-                        return
-                    logger.info(f"User confirmed overwriting entry for {date}")
-                    print_info(f"Confirmed overwriting entry for {date}")
-                except KeyboardInterrupt:
-                    logger.info("User interrupted overwrite confirmation")
-                    print_warning("\nOverwrite cancelled by user.")
-                    return
+        success_count, counts = execute_streaming_submission(stream, snapshot, force_overwrite)
         
-        logger.info(f"Submitting logbook for date: {date}")
-        print_info(f"Submitting logbook for date: {date}")
+        if stream.errors or stream.sundays:
+            logger.warning(f"Found {len(stream.errors)} CSV validation errors while streaming")
+            print_header("Validation Errors and Warnings")
+            for error in stream.errors:
+                print_error(error)
+            for warning in stream.sunday_warnings():
+                print_warning(warning)
+            print()
         
-        try:
-            if weekday == WEEKDAY_SATURDAY:
-                saturday_submission = os.getenv("SATURDAY_SUBMISSION", "false").lower() == "true"
-                
-                if not saturday_submission:
-                    logger.info(f"Saturday detected - submitting as OFF day for {date}")
-                    print_warning(f"Saturday detected - submitting as OFF day")
-                    response = submit_logbook(
-                        date=date,
-                        activity="OFF",
-                        clock_in="OFF",
-                        clock_out="OFF",
-                        description="OFF",
-                        force=True if existing_entry else force_overwrite
-                    )
-                else:
-                    logger.info(f"Saturday detected - submitting with provided values for {date}")
-                    print_warning(f"Saturday detected - submitting with provided values")
-                    response = submit_logbook(
-                        date=date,
-                        activity=activity,
-                        clock_in=clock_in,
-                        clock_out=clock_out,
-                        description=description,
-                        force=True if existing_entry else force_overwrite
-                    )
-            else:
-                response = submit_logbook(
-                    date=date,
-                    activity=activity,
-                    clock_in=clock_in,
-                    clock_out=clock_out,
-                    description=description,
-                    force=True if existing_entry else force_overwrite
-                )
-            
-            if "error" in response:
-                logger.error(f"Logbook submission failed for {date}: {response['error']}")
-                print_error(f"Logbook submission failed: {response['error']}")
-                return False
-            else:
-                logger.info(f"Logbook entry for {date} submitted successfully")
-                print_success(f"Logbook entry for {date} submitted successfully")
-                return True
-        except Exception as e:
-            logger.error(f"Cannot submit entry for {date}: {str(e)}")
-            print_error(f"Cannot submit entry for {date}: {str(e)}")
-            return False
-        finally:
-            logger.info(f"Waiting before next submission...")
-            print("Waiting for 1-2 seconds before next submission...")
-            time.sleep(random.uniform(1, 2))
-    except ValueError as e:
-        logger.error(f"Invalid date format for {date}: {str(e)}")
-        print_error(f"Invalid date format for {date}: {str(e)}")
+        total_entries = counts[PLAN_CREATE] + counts[PLAN_OVERWRITE]
+        logger.info(f"Streaming CSV processing completed: {success_count}/{total_entries} entries submitted successfully, {counts[PLAN_UNCHANGED]} unchanged")
+        print_info(f"Successfully submitted {success_count} out of {total_entries} entries")
+        if counts[PLAN_UNCHANGED]:
+            print_info(f"{counts[PLAN_UNCHANGED]} entries were already up to date and were not resubmitted")
+        # The stream drops Sundays itself, so any skip or block here means real work was not done.
+        all_unchanged = (
+            counts[PLAN_UNCHANGED] > 0 and total_entries == 0
+            and counts[PLAN_BLOCKED] == 0 and counts[PLAN_SKIP] == 0
+        )
+        return (success_count > 0 or all_unchanged) and not stream.failed
+    except KeyboardInterrupt:
+        logger.info("Streaming CSV processing interrupted by user")
+        print_warning("\nOperation cancelled by user.")
         return False
     except Exception as e:
-        logger.error(f"Unexpected error processing {date}: {str(e)}")
-        print_error(f"Unexpected error processing {date}: {str(e)}")
+        logger.error(f"Unexpected error during streaming CSV processing: {str(e)}")
+        print_error(f"Unexpected error: {str(e)}")
         return False
 
-def group_entries_by_month(csv_entries):
-    try:
-        entries_by_month = {}
-        for entry in csv_entries:
-            try:
-                date_obj = datetime.strptime(entry['date'], '%Y-%m-%d')
-                month = date_obj.month
-                year = date_obj.year
-                month_key = (year, month)
-                
-                if month_key not in entries_by_month:
-                    entries_by_month[month_key] = []
-                    
-                entries_by_month[month_key].append(entry)
-            except ValueError as e:
-                logger.error(f"Invalid date format in entry: {entry.get('date', 'unknown')} - {str(e)}")
-                continue
-            except Exception as e:
-                logger.error(f"Error processing entry: {str(e)}")
-                continue
-        
-        logger.info(f"Grouped entries by month: {len(entries_by_month)} months")
-        return entries_by_month
-    except Exception as e:
-        logger.error(f"Error grouping entries by month: {str(e)}")
-        return {}
-
 def process_csv_input():
+    if get_csv_settings()['stream']:
+        return process_csv_stream()
+    
     try:
         logger.info("Starting CSV input processing")
         csv_entries, csv_errors = import_from_csv()
@@ -444,16 +312,15 @@ def process_csv_input():
             return False
         
         try:
-            logger.info("Retrieving logbook months")
-            months_data = get_logbook_months()
+            logger.info("Retrieving logbook snapshot")
+            snapshot = LogbookSnapshot.fetch()
+            months_data = snapshot.months_data
             if not months_data:
                 logger.error("Failed to retrieve logbook months")
                 print_error("Failed to retrieve logbook months. Exiting.")
                 sys.exit(1)
             
-            logger.info("Checking month completion status")
-            completion_status = check_month_completion_status(months_data)
-            
+            completion_status = snapshot.completion_status
             display_available_months(completion_status)
             
             logger.info("Grouping entries by month")
@@ -496,65 +363,40 @@ def process_csv_input():
                 print_warning("\nOperation cancelled by user.")
                 return False
             
-            validated_entries = {}
-            
-            for (year, month), entries in entries_by_month.items():
-                if month not in months_data:
-                    continue
-                    
-                available, message = is_month_available_for_submission(month, year, completion_status)
-                
-                if not available:
-                    logger.error(f"Month {month}/{year} not available: {message}")
-                    print_error(f"Cannot submit entries for {months_data[month]['name']} {year}: {message}")
-                    print_error(f"Skipping entries for {months_data[month]['name']} {year}. Please complete previous months first.")
-                else:
-                    validated_entries[(year, month)] = entries
+            logger.info("Building submission plan")
+            plan = build_submission_plan(entries_by_month, snapshot, force_overwrite)
+            display_submission_plan(plan)
             
-            if not validated_entries:
-                logger.error("No valid entries to submit after validation")
-                print_error("No valid entries to submit after validation. Exiting.")
+            writes = get_plan_writes(plan)
+            if not writes:
+                # Sundays are never submitted, so they do not count against "all up to date".
+                workdays = [item for item in plan if item['entry'].weekday != WEEKDAY_SUNDAY]
+                if workdays and all(item['action'] == PLAN_UNCHANGED for item in workdays):
+                    logger.info("All planned entries are already up to date")
+                    print_success("All entries are already up to date. Nothing to submit.")
+                    return True
+                for item in plan:
+                    if item['action'] == PLAN_BLOCKED:
+                        logger.warning(f"Blocked {item['date']}: {item['reason']}")
+                        print_warning(f"Blocked {item['date']}: {item['reason']}")
+                logger.error("No entries to submit after planning")
+                print_error("No entries to submit after planning. Exiting.")
                 return False
             
-            success_count = 0
-            total_entries = sum(len(entries) for entries in validated_entries.values())
-            
-            logger.info(f"Starting submission of {total_entries} entries across {len(validated_entries)} months")
+            try:
+                print_info(f"Do you want to submit these {len(writes)} entries? (y/n):")
+                if input().strip().lower() != 'y':
+                    logger.info("User cancelled plan execution")
+                    print_warning("Operation cancelled by user.")
+                    return False
+            except KeyboardInterrupt:
+                logger.info("User interrupted plan confirmation")
+                print_warning("\nOperation cancelled by user.")
+                return False
             
-            for (year, month), entries in validated_entries.items():
-                logbook_header_id = months_data[month]['logBookHeaderID']
-                logger.info(f"Processing month {month}/{year} with header ID {logbook_header_id}")
-                print_info(f"Using LogBookHeaderID {logbook_header_id} for {months_data[month]['name']} {year}")
-                
-                try:
-                    existing_entries = get_logbook_entries(logbook_header_id)
-                    if "error" in existing_entries:
-                        logger.error(f"Error fetching existing entries for {months_data[month]['name']} {year}: {existing_entries['error']}")
-                        print_error(f"Error fetching existing entries for {months_data[month]['name']} {year}: {existing_entries['error']}")
-                        continue
-                except Exception as e:
-                    logger.error(f"Error fetching existing entries for {months_data[month]['name']} {year}: {str(e)}")
-                    print_error(f"Error fetching existing entries for {months_data[month]['name']} {year}: {str(e)}")
-                    continue
-                
-                for entry in entries:
-                    try:
-                        if process_single_day(
-                            date=entry['date'],
-                            activity=entry['activity'],
-                            clock_in=entry['clock_in'],
-                            clock_out=entry['clock_out'],
-                            description=entry['description'],
-                            existing_entries=existing_entries,
-                            force_overwrite=force_overwrite
-                        ):
-                            success_count += 1
-                    except Exception as e:
-                        logger.error(f"Error processing entry for {entry.get('date', 'unknown')}: {str(e)}")
-                        print_error(f"Error processing entry for {entry.get('date', 'unknown')}: {str(e)}")
-                        continue
-
-                
+            total_entries = len(writes)
+            logger.info(f"Starting submission of {total_entries} planned entries")
+            success_count = execute_submission_plan(plan, snapshot)
             
             logger.info(f"CSV processing completed: {success_count}/{total_entries} entries submitted successfully")
             print_info(f"Successfully submitted {success_count} out of {total_entries} entries")
@@ -573,10 +415,30 @@ def process_csv_input():
         print_error(f"Unexpected error: {str(e)}")
         return False
 
+def login_fresh_session(is_odd_semester):
+    logger.info("Starting fresh login session")
+    print_info("Starting fresh login session...")
+    from utils.login import login
+    username, password = get_credentials()
+    login_result = login(username=username, password=password, is_odd_semester=is_odd_semester)
+    if not login_result:
+        logger.error("Login failed")
+        print_error("Failed to log in. Please try again.")
+        sys.exit(1)
+    cookies = load_cookies()
+    if not cookies:
+        logger.error("Failed to save login session")
+        print_error("Failed to save login session. Exiting.")
+        sys.exit(1)
+
 def main():
     try:
         logger.info("Starting nullog application")
-        check_for_update()
+        logger.info(f"Startup imports took {IMPORT_SECONDS * 1000:.0f} ms")
+        if IMPORT_SECONDS > IMPORT_TIME_BUDGET:
+            logger.warning(f"Startup imports exceeded the {IMPORT_TIME_BUDGET * 1000:.0f} ms budget")
+        # Runs in the background while the disclaimer is shown; startup never waits for it
+        update_check = start_update_check()
         
         print_header("nullog - Automated Logbook System")
         print_header("DISCLAIMER")
@@ -601,32 +463,29 @@ def main():
             sys.exit(0)
         
         logger.info("User accepted disclaimer")
+        update_check.report()
         
         # Prompt for semester selection
         print_info("Is this an odd semester? (y/n):")
         odd_input = input().strip().lower()
         is_odd_semester = odd_input == 'y'
         
-        # Always perform fresh login session
+        # Reuse the stored session when the server still accepts it; otherwise log in
         try:
-            logger.info("Starting fresh login session")
-            print_info("Starting fresh login session...")
-            username, password = get_credentials()
-            login_result = login(username=username, password=password, is_odd_semester=is_odd_semester)
-            if not login_result:
-                logger.error("Login failed")
-                print_error("Failed to log in. Please try again.")
-                sys.exit(1)
-            cookies = load_cookies()
-            if not cookies:
-                logger.error("Failed to save login session")
-                print_error("Failed to save login session. Exiting.")
-                sys.exit(1)
+            print_info("Checking saved session...")
+            if probe_session(is_odd_semester):
+                logger.info("Saved session is valid; skipping login")
+                print_success("Saved session is still valid. Skipping login.")
+            else:
+                login_fresh_session(is_odd_semester)
         except Exception as e:
             logger.error(f"Error during session management: {str(e)}")
             print_error(f"Error during session management: {str(e)}")
             sys.exit(1)
         
+        # Keep the session alive in the background so long runs do not stop for a login
+        start_session_refresher()
+        
         # Process CSV input
         try:
             if not process_csv_input():
@@ -637,6 +496,9 @@ def main():
             logger.error(f"Error during CSV processing: {str(e)}")
             print_error(f"Error during CSV processing: {str(e)}")
             sys.exit(1)
+        finally:
+            stop_session_refresher()
+            session_store.flush(force=True)
         
         logger.info("Program completed successfully")
         print_success("Program completed successfully!")
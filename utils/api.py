@@ -1,36 +1,75 @@
 import requests
 import json
 import sys
+import threading
+import time
 from datetime import datetime
-from utils.cookies import load_cookies, load_user_agent
-from utils.login import login
-from utils.config import get_credentials
-from utils.utils import format_iso_date, convert_12hour, logger
+from utils.cookies import (
+    load_cookies, load_user_agent, load_session_semester, record_session_expiry, apply_response_cookies,
+    parse_set_cookie_headers
+)
+from utils.config import get_credentials, get_rate_limit_settings, get_retry_settings
+from utils.utils import format_iso_date, session_store, logger
+from utils.http_client import get_http_session, get_http_timeout
+from utils.reauth import ReauthCoordinator, ReauthenticationError
+from utils.entries import LogEntry
+from utils.rate_limit import TokenBucket, AdaptiveTokenBucket
+from utils.retry import RetryPolicy, parse_retry_after
 from utils.constants import (
-    LOGBOOK_GET_MONTHS_URL, LOGBOOK_GET_LOGBOOK_URL, 
-    LOGBOOK_STUDENT_SAVE_URL, REFERER_URL
+    BASE_URL, LOGBOOK_GET_MONTHS_URL, LOGBOOK_GET_LOGBOOK_URL, 
+    LOGBOOK_STUDENT_SAVE_URL, EMPTY_ENTRY_ID
 )
 from utils.display import print_info, print_error, print_success, print_warning
 
-def prepare_request_params():
+_rate_limiters = {}
+_retry_policies = {}
+_rate_limiters_lock = threading.Lock()
+
+def get_rate_limiter(url):
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(url)
+        if limiter is None:
+            is_write = url == LOGBOOK_STUDENT_SAVE_URL
+            settings = get_rate_limit_settings(write=is_write)
+            name = url.rsplit('/', 1)[-1]
+            if settings['adaptive'] and settings['rate'] > 0:
+                limiter = AdaptiveTokenBucket(
+                    settings['rate'], settings['burst'],
+                    min_rate=settings['min_rate'],
+                    max_rate=max(settings['max_rate'], settings['rate']),
+                    increase_step=settings['increase_step'],
+                    decrease_factor=settings['decrease_factor'],
+                    latency_threshold=settings['latency_threshold'],
+                    name=name
+                )
+            else:
+                limiter = TokenBucket(settings['rate'], settings['burst'], name=name)
+            _rate_limiters[url] = limiter
+            logger.debug(f"Rate limiter for {url}: {settings['rate']} req/s, burst {settings['burst']}, adaptive {settings['adaptive']}")
+        return limiter
+
+def prepare_request_params(allow_login=True, check_freshness=True):
     try:
         # Prefer using saved cookies; login only if unavailable/stale
-        cookies_data = load_cookies()
+        generation = get_session_generation()
+        cookies_data = load_cookies(check_freshness=check_freshness)
+        if not cookies_data and allow_login and load_cookies(check_freshness=False) and probe_session():
+            # Past its expected lifetime but still accepted; the probe extended the window.
+            cookies_data = load_cookies()
         if not cookies_data:
+            if not allow_login:
+                raise ValueError("No saved session available.")
             logger.info("No valid saved cookies; performing login to refresh session")
-            username, password = get_credentials()
-            login_result = login(username=username, password=password)
-            if not login_result:
-                error_msg = "Failed to log in to refresh session."
-                logger.error(error_msg)
-                raise ValueError(error_msg)
+            refresh_session(generation)
             cookies_data = load_cookies()
             if not cookies_data:
                 error_msg = "No cookies available after login."
                 logger.error(error_msg)
-                raise ValueError(error_msg)
+                raise ReauthenticationError(error_msg)
                 
-        cookies = {cookie['name']: cookie['value'] for cookie in cookies_data}
+        cookies = session_store.get_cookie_jar()
+        if cookies is None:
+            raise ValueError("Stored session has no cookie list.")
         user_agent = load_user_agent()
         
         logger.debug(f"Prepared request params: {len(cookies)} cookies, user agent: {user_agent[:50]}...")
@@ -39,73 +78,205 @@ def prepare_request_params():
         logger.error(f"Error preparing request parameters: {str(e)}")
         raise
 
-def make_api_request(method, url, headers=None, data=None, params=None, retry_on_403=True):
+def _login_with_saved_settings():
+    # The browser stack is only imported when a login actually happens.
+    from utils.login import login
+    username, password = get_credentials()
+    login_result = login(username=username, password=password, is_odd_semester=load_session_semester())
+    return bool(login_result)
+
+_reauth = ReauthCoordinator(_login_with_saved_settings)
+
+def get_session_generation():
+    return _reauth.generation
+
+def refresh_session(seen_generation=None):
+    # Callers pass the generation their cookies came from, so concurrent 403s share a single login.
+    # Raises ReauthenticationError when the login fails.
+    return _reauth.refresh(seen_generation)
+
+def probe_session(is_odd_semester=None):
+    # Cheap authenticated GetMonths call to decide whether the stored session can be reused.
     try:
-        cookies, user_agent = prepare_request_params()
-        
-        if headers is None:
-            headers = {}
-        
-        if 'User-Agent' not in headers:
-            headers['User-Agent'] = user_agent
-        
-        headers.setdefault('X-Requested-With', 'XMLHttpRequest')
-        headers.setdefault('Referer', REFERER_URL)
-        
-        logger.debug(f"Making {method.upper()} request to {url}")
-        
-        if method.lower() == 'post':
-            headers.setdefault('Content-Type', 'application/x-www-form-urlencoded; charset=UTF-8')
-            headers.setdefault('Origin', 'https://activity-enrichment.apps.binus.ac.id')
-            response = requests.post(url, cookies=cookies, headers=headers, data=data, timeout=30)
-        else:
-            response = requests.get(url, cookies=cookies, headers=headers, params=params, timeout=30)
-        
-        logger.debug(f"Response status: {response.status_code}")
-        
-        if response.status_code == 403 and retry_on_403:
-            logger.warning("Session expired (403 error). Attempting to re-login.")
-            print_warning("Session expired. Logging in again.")
-            try:
-                username, password = get_credentials()
-                login_result = login(username=username, password=password)
-                if not login_result:
-                    logger.error("Failed to re-login")
-                    print_error("Failed to re-login. Exiting.")
-                    sys.exit(1)
-                logger.info("Re-login successful, retrying request")
-                return make_api_request(method, url, headers, data, params, retry_on_403=False)
-            except Exception as e:
-                logger.error(f"Error during re-login: {str(e)}")
-                print_error(f"Error during re-login: {str(e)}")
-                sys.exit(1)
-        
+        if is_odd_semester is not None and load_session_semester() != bool(is_odd_semester):
+            logger.info("Stored session was created for a different semester; not reusing it")
+            return False
+        
+        if not load_cookies(check_freshness=False):
+            return False
+        
+        cookies, user_agent = prepare_request_params(allow_login=False, check_freshness=False)
+        get_rate_limiter(LOGBOOK_GET_MONTHS_URL).acquire()
+        response = get_http_session().get(
+            LOGBOOK_GET_MONTHS_URL, cookies=cookies,
+            headers={'User-Agent': user_agent}, timeout=get_http_timeout()
+        )
         if response.status_code != 200:
-            error_msg = f"API request failed with status code {response.status_code}"
-            logger.error(f"{error_msg} - URL: {url}")
-            logger.error(f"Response: {response.text[:500]}...")
+            logger.info(f"Session probe rejected with status {response.status_code}")
+            return False
+        
+        if not parse_months_data(response.json()):
+            logger.info("Session probe returned no month data")
+            return False
+        
+        session_store.mark_accepted()
+        logger.info("Stored session is valid")
+        return True
+    except ValueError as e:
+        logger.info(f"Session probe failed: {str(e)}")
+        return False
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Session probe request failed: {str(e)}")
+        return False
+
+def get_retry_policy(url):
+    with _rate_limiters_lock:
+        policy = _retry_policies.get(url)
+        if policy is None:
+            settings = get_retry_settings(write=url == LOGBOOK_STUDENT_SAVE_URL)
+            policy = RetryPolicy(
+                settings['max_attempts'], settings['base_delay'], settings['max_delay'],
+                settings['budget'], name=url.rsplit('/', 1)[-1]
+            )
+            _retry_policies[url] = policy
+        return policy
+
+def _wait_before_retry(policy, attempt, reason, retry_after=None):
+    delay = policy.get_delay(attempt, retry_after)
+    logger.warning(f"{reason}; retrying in {delay:.1f}s (attempt {attempt + 1}/{policy.max_attempts})")
+    print_warning(f"{reason}. Retrying in {delay:.1f}s...")
+    time.sleep(delay)
+
+def _set_cookie_headers(response):
+    # response.cookies drops Set-Cookie headers that delete a cookie, so read the raw headers,
+    # including those of any redirects.
+    headers = []
+    for item in list(response.history) + [response]:
+        raw_headers = getattr(item.raw, 'headers', None)
+        if raw_headers is not None and hasattr(raw_headers, 'getlist'):
+            headers.extend(raw_headers.getlist('Set-Cookie'))
+    return headers
+
+def make_api_request(method, url, headers=None, data=None, params=None, retry_on_403=True, idempotent=None):
+    limiter = get_rate_limiter(url)
+    policy = get_retry_policy(url)
+    if idempotent is None:
+        # Reads (GET, GetLogBook) are always safe to repeat; StudentSave only when the caller says so.
+        idempotent = method.lower() == 'get' or url != LOGBOOK_STUDENT_SAVE_URL
+    
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            generation = get_session_generation()
+            cookies, user_agent = prepare_request_params()
+            
+            if headers is None:
+                headers = {}
+            
+            if 'User-Agent' not in headers:
+                headers['User-Agent'] = user_agent
+            
+            session = get_http_session()
+            timeout = get_http_timeout()
+            
+            limiter.acquire()
+            logger.debug(f"Making {method.upper()} request to {url}")
+            
+            started = time.perf_counter()
+            if method.lower() == 'post':
+                headers.setdefault('Content-Type', 'application/x-www-form-urlencoded; charset=UTF-8')
+                headers.setdefault('Origin', BASE_URL)
+                response = session.post(url, cookies=cookies, headers=headers, data=data, timeout=timeout)
+            else:
+                response = session.get(url, cookies=cookies, headers=headers, params=params, timeout=timeout)
+            latency = time.perf_counter() - started
+            
+            logger.debug(f"Response status: {response.status_code} in {latency:.2f}s")
+            limiter.record_response(latency=latency, status_code=response.status_code)
+            
+            if response.status_code == 403 and retry_on_403:
+                logger.warning("Session expired (403 error). Attempting to re-login.")
+                print_warning("Session expired. Logging in again.")
+                record_session_expiry()
+                refresh_session(generation)
+                logger.info("Re-login successful, retrying request")
+                return make_api_request(method, url, headers, data, params, retry_on_403=False, idempotent=idempotent)
+            
+            if response.status_code != 200:
+                if policy.is_retryable_status(response.status_code, idempotent) and policy.allow_retry(attempt):
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    _wait_before_retry(policy, attempt, f"API request returned {response.status_code}", retry_after)
+                    continue
+                
+                error_msg = f"API request failed with status code {response.status_code}"
+                logger.error(f"{error_msg} - URL: {url}")
+                logger.error(f"Response: {response.text[:500]}...")
+                print_error(error_msg)
+                print_error(f"URL: {url}")
+                print_error(f"Response: {response.text[:500]}...")
+                return None
+                
+            logger.debug("API request successful")
+            session_store.mark_accepted()
+            apply_response_cookies(parse_set_cookie_headers(_set_cookie_headers(response)))
+            return response
+        except requests.exceptions.Timeout as e:
+            limiter.record_response(failed=True)
+            # A connect timeout means the request never reached the server.
+            safe = idempotent or isinstance(e, requests.exceptions.ConnectTimeout)
+            if safe and policy.allow_retry(attempt):
+                _wait_before_retry(policy, attempt, f"API request timed out for {url}")
+                continue
+            error_msg = f"API request timed out for {url}"
+            logger.error(error_msg)
             print_error(error_msg)
-            print_error(f"URL: {url}")
-            print_error(f"Response: {response.text[:500]}...")
             return None
-            
-        logger.debug("API request successful")
-        return response
-    except requests.exceptions.Timeout:
-        error_msg = f"API request timed out for {url}"
-        logger.error(error_msg)
-        print_error(error_msg)
-        return None
-    except requests.exceptions.ConnectionError:
-        error_msg = f"Connection error for {url}"
-        logger.error(error_msg)
-        print_error(error_msg)
-        return None
-    except Exception as e:
-        error_msg = f"API request failed: {str(e)}"
-        logger.error(error_msg)
-        print_error(error_msg)
+        except requests.exceptions.ConnectionError:
+            limiter.record_response(failed=True)
+            if idempotent and policy.allow_retry(attempt):
+                _wait_before_retry(policy, attempt, f"Connection error for {url}")
+                continue
+            error_msg = f"Connection error for {url}"
+            logger.error(error_msg)
+            print_error(error_msg)
+            return None
+        except ReauthenticationError:
+            raise
+        except Exception as e:
+            error_msg = f"API request failed: {str(e)}"
+            logger.error(error_msg)
+            print_error(error_msg)
+            return None
+
+def parse_months_data(data):
+    if not isinstance(data, dict) or not isinstance(data.get('data'), list):
         return None
+    
+    months_data = {}
+    current_year = datetime.now().year
+    
+    for item in data['data']:
+        try:
+            if not all(k in item for k in ['monthInt', 'logBookHeaderID']):
+                logger.warning(f"Skipping incomplete month data: {item}")
+                continue
+            
+            year = item.get('year') or current_year
+            
+            months_data[item['monthInt']] = {
+                'logBookHeaderID': item['logBookHeaderID'],
+                'name': item.get('month', f"Month {item['monthInt']}"),
+                'isCurrentMonth': item.get('isCurrentMonth', False),
+                'countData': item.get('countData', 0),
+                'isWarning': item.get('isWarning', False),
+                'year': year
+            }
+        except Exception as e:
+            logger.warning(f"Error processing month data: {str(e)}")
+            continue
+    
+    return months_data
 
 def get_logbook_months(logbook_id=""):
     try:
@@ -121,49 +292,21 @@ def get_logbook_months(logbook_id=""):
         
         try:
             data = response.json()
-            if not isinstance(data, dict):
+            months_data = parse_months_data(data)
+            if months_data is None:
                 error_msg = f"Unexpected response format: {data}"
                 logger.error(error_msg)
                 print_error(error_msg)
                 sys.exit(1)
-                
-            if 'data' in data and isinstance(data['data'], list):
-                months_data = {}
-                current_year = datetime.now().year
-                
-                for item in data['data']:
-                    try:
-                        if not all(k in item for k in ['monthInt', 'logBookHeaderID']):
-                            logger.warning(f"Skipping incomplete month data: {item}")
-                            continue
-                        
-                        year = item.get('year') or current_year
-                        
-                        months_data[item['monthInt']] = {
-                            'logBookHeaderID': item['logBookHeaderID'],
-                            'name': item.get('month', f"Month {item['monthInt']}"),
-                            'isCurrentMonth': item.get('isCurrentMonth', False),
-                            'countData': item.get('countData', 0),
-                            'isWarning': item.get('isWarning', False),
-                            'year': year
-                        }
-                    except Exception as e:
-                        logger.warning(f"Error processing month data: {str(e)}")
-                        continue
-                
-                if not months_data:
-                    error_msg = "No valid month data found in the response. Exiting."
-                    logger.error(error_msg)
-                    print_error(error_msg)
-                    sys.exit(1)
-                    
-                logger.info(f"Successfully retrieved {len(months_data)} months")
-                return months_data
-            else:
-                error_msg = f"Unexpected response format: {data}"
+            
+            if not months_data:
+                error_msg = "No valid month data found in the response. Exiting."
                 logger.error(error_msg)
                 print_error(error_msg)
                 sys.exit(1)
+                
+            logger.info(f"Successfully retrieved {len(months_data)} months")
+            return months_data
         except json.JSONDecodeError as e:
             error_msg = f"Invalid JSON response: {response.text[:500]}... Error: {str(e)}"
             logger.error(error_msg)
@@ -174,48 +317,59 @@ def get_logbook_months(logbook_id=""):
             logger.error(error_msg)
             print_error(error_msg)
             sys.exit(1)
+    except ReauthenticationError:
+        raise
     except Exception as e:
         error_msg = f"Unexpected error in get_logbook_months: {str(e)}"
         logger.error(error_msg)
         print_error(error_msg)
         sys.exit(1)
 
-def check_month_completion_status(months_data):
+def build_month_status(month_info, entries_data):
+    filled_empty = entries_data.get("filledEmpty", 0)
+    filled = entries_data.get("filled", 0)
+    filled_submit = entries_data.get("filledSubmit", 0)
+    filled_all = entries_data.get("filledAll", filled)
+    return {
+        'completed': filled_empty == 0,
+        'empty_entries': filled_empty,
+        'filled_entries': filled,
+        'submitted_entries': filled_submit,
+        'filledSubmit': filled_submit,
+        'filledAll': filled_all,
+        'month_name': month_info['name'],
+        'year': month_info['year'],
+        'header_id': month_info['logBookHeaderID']
+    }
+
+def check_month_completion_status(months_data, entries_by_month=None):
     try:
         logger.info("Checking month completion status")
         completion_status = {}
         
         for month, month_info in months_data.items():
             try:
-                logbook_header_id = month_info['logBookHeaderID']
-                entries_data = get_logbook_entries(logbook_header_id)
+                if entries_by_month is not None and month in entries_by_month:
+                    entries_data = entries_by_month[month]
+                else:
+                    entries_data = get_logbook_entries(month_info['logBookHeaderID'])
                 
                 if isinstance(entries_data, dict) and not entries_data.get("error"):
-                    filled_empty = entries_data.get("filledEmpty", 0)
-                    filled = entries_data.get("filled", 0)
-                    filled_submit = entries_data.get("filledSubmit", 0)
-                    filled_all = entries_data.get("filledAll", filled)
-                    completed = filled_empty == 0
-                    completion_status[month] = {
-                        'completed': completed,
-                        'empty_entries': filled_empty,
-                        'filled_entries': filled,
-                        'submitted_entries': filled_submit,
-                        'filledSubmit': filled_submit,
-                        'filledAll': filled_all,
-                        'month_name': month_info['name'],
-                        'year': month_info['year'],
-                        'header_id': logbook_header_id
-                    }
-                    logger.debug(f"Month {month} status: {filled_empty} empty, {filled} filled, {filled_submit} submitted")
+                    status = build_month_status(month_info, entries_data)
+                    completion_status[month] = status
+                    logger.debug(f"Month {month} status: {status['empty_entries']} empty, {status['filled_entries']} filled, {status['submitted_entries']} submitted")
                 else:
                     logger.warning(f"Could not get completion status for month {month}")
+            except ReauthenticationError:
+                raise
             except Exception as e:
                 logger.error(f"Error checking completion status for month {month}: {str(e)}")
                 continue
         
         logger.info(f"Completed status check for {len(completion_status)} months")
         return completion_status
+    except ReauthenticationError:
+        raise
     except Exception as e:
         logger.error(f"Error in check_month_completion_status: {str(e)}")
         return {}
@@ -278,84 +432,216 @@ def get_logbook_entries(logbook_header_id):
             logger.error(error_msg)
             print_error(error_msg)
             sys.exit(1)
+    except ReauthenticationError:
+        raise
     except Exception as e:
         logger.error(f"Unexpected error in get_logbook_entries: {str(e)}")
         return {"error": str(e)}
 
-def get_entry_for_date(entries_data, target_date):
-    try:
-        if not entries_data or "data" not in entries_data:
-            logger.debug(f"No entries data available for date {target_date}")
-            return None
-        
-        date_str = format_iso_date(target_date)
-        logger.debug(f"Looking for entry with date: {date_str}")
-        
-        for entry in entries_data["data"]:
-            if entry["date"] == date_str:
-                if entry["id"] != "00000000-0000-0000-0000-000000000000" and entry["clockIn"]:
-                    logger.debug(f"Found existing entry for {target_date}")
-                    return entry
-        
-        logger.debug(f"No existing entry found for {target_date}")
-        return None
-    except Exception as e:
-        logger.error(f"Error getting entry for date {target_date}: {str(e)}")
-        return None
+def _is_filled(row):
+    return row.get("id") != EMPTY_ENTRY_ID and bool(row.get("clockIn"))
 
-def is_date_filled(entries_data, target_date):
-    try:
-        return get_entry_for_date(entries_data, target_date) is not None
-    except Exception as e:
-        logger.error(f"Error checking if date {target_date} is filled: {str(e)}")
-        return False
+class EntryIndex:
+    """One month's existing entries keyed by ISO date, built once per fetch.
 
-def is_previous_month_completed(current_month, current_year):
-    try:
-        previous_month = current_month - 1
-        previous_year = current_year
-        
-        if previous_month == 0:
-            previous_month = 12
-            previous_year -= 1
-        
-        logger.info(f"Checking completion status for previous month: {previous_month}/{previous_year}")
-        
+    Placeholder rows (all-zero ID or no clock in) are kept apart from filled ones, so existence
+    checks and overwrite decisions are a single lookup.
+    """
+
+    __slots__ = ('filled', 'placeholders')
+
+    def __init__(self, entries_data):
+        self.filled = {}
+        self.placeholders = {}
+        for row in (entries_data or {}).get("data") or []:
+            target = self.filled if _is_filled(row) else self.placeholders
+            target.setdefault(row.get("date"), row)
+
+    def get(self, iso_date):
+        return self.filled.get(iso_date)
+
+    def get_row(self, iso_date):
+        return self.filled.get(iso_date) or self.placeholders.get(iso_date)
+
+    def mark_filled(self, iso_date, row):
+        self.placeholders.pop(iso_date, None)
+        self.filled[iso_date] = row
+
+def _month_and_iso_date(date):
+    # Accepts a LogEntry, a datetime or a YYYY-MM-DD string.
+    if isinstance(date, LogEntry):
+        return date.month, date.iso_date
+    date_obj = datetime.strptime(date, '%Y-%m-%d') if isinstance(date, str) else date
+    return date_obj.month, format_iso_date(date_obj)
+
+class LogbookSnapshot:
+    """Months, entries and completion status fetched once per run and kept current locally."""
+
+    def __init__(self, months_data, entries_by_month):
+        self._lock = threading.RLock()
+        self.months_data = months_data
+        self.entries_by_month = entries_by_month
+        self.indexes = {month: EntryIndex(data) for month, data in entries_by_month.items()}
+        self.completion_status = check_month_completion_status(months_data, entries_by_month)
+
+    @classmethod
+    def fetch(cls):
+        logger.info("Fetching logbook snapshot")
         months_data = get_logbook_months()
+        entries_by_month = {}
         
-        if previous_month not in months_data:
-            logger.info(f"No logbook data found for previous month ({previous_month}/{previous_year}).")
-            print_info(f"No logbook data found for previous month ({previous_month}/{previous_year}).")
-            return True, None
-        
-        logbook_header_id = months_data[previous_month]['logBookHeaderID']
-        entries_data = get_logbook_entries(logbook_header_id)
-        
-        if not entries_data or not isinstance(entries_data, dict) or "error" in entries_data:
-            logger.warning(f"Could not retrieve data for previous month ({previous_month}/{previous_year}).")
-            print_warning(f"Could not retrieve data for previous month ({previous_month}/{previous_year}).")
-            return True, None
-        
-        filled_empty = entries_data.get("filledEmpty", 0)
-        filled = entries_data.get("filled", 0)
-        filled_submit = entries_data.get("filledSubmit", 0)
-        
-        logger.info(f"Previous month status: {filled_empty} unfilled, {filled} filled, {filled_submit} submitted")
-        print_info(f"Previous month status: {filled_empty} unfilled, {filled} filled, {filled_submit} submitted")
-        
-        if filled_empty > 0:
-            message = (f"Previous month ({previous_month}/{previous_year}) has {filled_empty} "
-                      f"unfilled entries. Please complete them first.")
-            logger.warning(message)
-            return False, message
+        for month, month_info in months_data.items():
+            entries_data = get_logbook_entries(month_info['logBookHeaderID'])
+            if isinstance(entries_data, dict) and "error" not in entries_data:
+                entries_by_month[month] = entries_data
+            else:
+                logger.warning(f"Could not fetch entries for month {month}; it will be treated as unavailable")
         
-        logger.info("Previous month is completed")
-        return True, None
-    except Exception as e:
-        logger.error(f"Error checking previous month completion: {str(e)}")
-        return True, None
+        logger.info(f"Logbook snapshot fetched: {len(months_data)} months, {len(entries_by_month)} with entries")
+        return cls(months_data, entries_by_month)
+
+    def get_header_id(self, month):
+        month_info = self.months_data.get(month)
+        return month_info['logBookHeaderID'] if month_info else None
+
+    def get_entries(self, month):
+        return self.entries_by_month.get(month)
+
+    def get_index(self, month):
+        return self.indexes.get(month)
+
+    def get_existing_entry(self, date):
+        month, iso_date = _month_and_iso_date(date)
+        with self._lock:
+            index = self.indexes.get(month)
+            if index is None:
+                return None
+            return index.get(iso_date)
+
+    def is_month_available(self, month, year):
+        with self._lock:
+            return is_month_available_for_submission(month, year, self.completion_status)
+
+    def record_submission(self, entry, entry_id):
+        with self._lock:
+            self._record_submission(entry, entry_id)
 
-def submit_logbook(date, activity, clock_in, clock_out, description, force=False):
+    def _record_submission(self, entry, entry_id):
+        try:
+            month = entry.month
+            entries_data = self.entries_by_month.get(month)
+            if entries_data is None:
+                return
+            
+            date_str = entry.iso_date
+            index = self.indexes.get(month)
+            if index is None:
+                index = self.indexes[month] = EntryIndex(entries_data)
+            row = index.get_row(date_str)
+            if row is None:
+                row = {"id": EMPTY_ENTRY_ID, "date": date_str}
+                entries_data.setdefault("data", []).append(row)
+            
+            was_empty = not _is_filled(row)
+            if entry_id and entry_id != EMPTY_ENTRY_ID:
+                row["id"] = entry_id
+            row["activity"] = entry.activity
+            row["clockIn"] = entry.clock_in_12hr
+            row["clockOut"] = entry.clock_out_12hr
+            row["description"] = entry.description
+            index.mark_filled(date_str, row)
+            
+            if was_empty:
+                entries_data["filledEmpty"] = max(entries_data.get("filledEmpty", 0) - 1, 0)
+                entries_data["filled"] = entries_data.get("filled", 0) + 1
+            
+            if month in self.months_data:
+                self.completion_status[month] = build_month_status(self.months_data[month], entries_data)
+            logger.debug(f"Snapshot updated for {date_str}")
+        except Exception as e:
+            logger.warning(f"Could not update logbook snapshot for {entry.date}: {str(e)}")
+
+def _extract_entry_id(result):
+    if not isinstance(result, dict):
+        return None
+    candidates = [result, result.get("data")]
+    for candidate in candidates:
+        if isinstance(candidate, dict):
+            entry_id = candidate.get("id") or candidate.get("ID")
+            if isinstance(entry_id, str) and entry_id:
+                return entry_id
+    return None
+
+def prepare_submission(entry, force, snapshot):
+    month = entry.month
+    
+    available, message = snapshot.is_month_available(month, entry.year)
+    if not available:
+        logger.error(f"Month not available: {message}")
+        print_error(message)
+        return None, {"error": message}
+    
+    logbook_header_id = snapshot.get_header_id(month)
+    if logbook_header_id:
+        logger.info(f"Using LogBookHeaderID {logbook_header_id} for month {month}")
+        print_info(f"Using LogBookHeaderID {logbook_header_id} for month {month}")
+    else:
+        error_msg = f"No LogBookHeaderID found for month {month}. Cannot proceed."
+        logger.error(error_msg)
+        print_error(error_msg)
+        return None, {"error": f"No LogBookHeaderID found for month {month}"}
+    
+    existing_entry = snapshot.get_existing_entry(entry)
+    
+    if existing_entry and not force:
+        error_msg = f"Logbook entry for date {entry.date} is already filled."
+        logger.warning(error_msg)
+        print_error(error_msg)
+        return None, {"error": f"Logbook entry for date {entry.date} is already filled"}
+    
+    if existing_entry and entry.matches(existing_entry):
+        message = f"Logbook entry for date {entry.date} is already up to date"
+        logger.info(message)
+        print_info(message)
+        return None, {"success": True, "unchanged": True, "message": message}
+    
+    entry_id = EMPTY_ENTRY_ID
+    if existing_entry and force:
+        entry_id = existing_entry["id"]
+        logger.warning(f"Modifying existing entry with ID: {entry_id}")
+        print_warning(f"Modifying existing entry with ID: {entry_id}")
+
+    payload = {
+        "model[ID]": entry_id,
+        "model[LogBookHeaderID]": logbook_header_id,
+        "model[Date]": entry.iso_date,
+        "model[Activity]": entry.activity,
+        "model[ClockIn]": entry.clock_in_12hr,
+        "model[ClockOut]": entry.clock_out_12hr,
+        "model[Description]": entry.description,
+        "model[flagjulyactive]": "false"
+    }
+    
+    submission = {
+        'payload': payload,
+        'entry_id': entry_id,
+        'entry': entry
+    }
+    return submission, None
+
+def handle_submission_result(result, submission, snapshot):
+    if isinstance(result, dict) and result.get('success') is False:
+        error_msg = f"Server rejected submission: {result.get('message', 'Unknown error')}"
+        logger.error(error_msg)
+        print_error(error_msg)
+        return {"error": result.get('message', 'Unknown error')}
+    
+    entry = submission['entry']
+    snapshot.record_submission(entry, _extract_entry_id(result) or submission['entry_id'])
+    logger.info(f"Logbook submission successful for {entry.date}")
+    return result
+
+def submit_logbook(date, activity, clock_in, clock_out, description, force=False, snapshot=None):
     try:
         logger.info(f"Submitting logbook entry for {date}")
         
@@ -364,116 +650,64 @@ def submit_logbook(date, activity, clock_in, clock_out, description, force=False
             logger.error(error_msg)
             print_error(error_msg)
             return {"error": "Missing required fields"}
+        
+        if not isinstance(date, (str, datetime)):
+            error_msg = "Date must be a string in YYYY-MM-DD format or a datetime object"
+            logger.error(error_msg)
+            print_error(error_msg)
+            return {"error": "Invalid date format"}
             
         try:
-            if isinstance(date, str):
-                date_obj = datetime.strptime(date, '%Y-%m-%d')
-            elif isinstance(date, datetime):
-                date_obj = date
-            else:
-                error_msg = "Date must be a string in YYYY-MM-DD format or a datetime object"
-                logger.error(error_msg)
-                print_error(error_msg)
-                return {"error": "Invalid date format"}
-            
-            date_str = format_iso_date(date_obj)
-            clock_in_12hr = convert_12hour(clock_in)
-            clock_out_12hr = convert_12hour(clock_out)
-            month = date_obj.month
-            year = date_obj.year
-            
-            logger.debug(f"Formatted data: date={date_str}, clock_in={clock_in_12hr}, clock_out={clock_out_12hr}")
-            
-            is_complete, message = is_previous_month_completed(month, year)
-            if not is_complete:
-                logger.error(f"Previous month not completed: {message}")
-                print_error(message)
-                return {"error": message}
-            
-            months_data = get_logbook_months()
-            if not months_data:
-                error_msg = "Failed to retrieve months data"
-                logger.error(error_msg)
-                print_error(error_msg)
-                return {"error": "Failed to retrieve months data"}
-                
-            completion_status = check_month_completion_status(months_data)
-            available, message = is_month_available_for_submission(month, year, completion_status)
-            
-            if not available:
-                logger.error(f"Month not available: {message}")
-                print_error(message)
-                return {"error": message}
-            
-            if month in months_data:
-                logbook_header_id = months_data[month]['logBookHeaderID']
-                logger.info(f"Using LogBookHeaderID {logbook_header_id} for month {month}")
-                print_info(f"Using LogBookHeaderID {logbook_header_id} for month {month}")
-            else:
-                error_msg = f"No LogBookHeaderID found for month {month}. Cannot proceed."
-                logger.error(error_msg)
-                print_error(error_msg)
-                return {"error": f"No LogBookHeaderID found for month {month}"}
-            
-            entries_data = get_logbook_entries(logbook_header_id)
-            existing_entry = get_entry_for_date(entries_data, date_obj.strftime('%Y-%m-%d'))
-            
-            if existing_entry and not force:
-                error_msg = f"Logbook entry for date {date_obj.strftime('%Y-%m-%d')} is already filled."
-                logger.warning(error_msg)
-                print_error(error_msg)
-                return {"error": f"Logbook entry for date {date_obj.strftime('%Y-%m-%d')} is already filled"}
-            
-            entry_id = "00000000-0000-0000-0000-000000000000"
-            if existing_entry and force:
-                entry_id = existing_entry["id"]
-                logger.warning(f"Modifying existing entry with ID: {entry_id}")
-                print_warning(f"Modifying existing entry with ID: {entry_id}")
-
-            payload = {
-                "model[ID]": entry_id,
-                "model[LogBookHeaderID]": logbook_header_id,
-                "model[Date]": date_str,
-                "model[Activity]": activity,
-                "model[ClockIn]": clock_in_12hr,
-                "model[ClockOut]": clock_out_12hr,
-                "model[Description]": description,
-                "model[flagjulyactive]": "false"
-            }
-            
-            logger.debug(f"Submitting payload: {payload}")
-            response = make_api_request('POST', LOGBOOK_STUDENT_SAVE_URL, data=payload)
-            
-            if not response:
-                error_msg = "Failed to submit logbook entry"
-                logger.error(error_msg)
-                print_error(error_msg)
-                return {"error": "Failed to submit logbook entry"}
-                
-            try:
-                result = response.json()
-                if isinstance(result, dict) and result.get('success') is False:
-                    error_msg = f"Server rejected submission: {result.get('message', 'Unknown error')}"
-                    logger.error(error_msg)
-                    print_error(error_msg)
-                    return {"error": result.get('message', 'Unknown error')}
-                
-                logger.info(f"Logbook submission successful for {date}")
-                return result
-            except json.JSONDecodeError as e:
-                error_msg = f"Failed to parse response: {response.text[:500]}... Error: {str(e)}"
-                logger.error(error_msg)
-                print_error(error_msg)
-                return {"error": "Failed to parse response", "raw": response.text}
+            entry = LogEntry.create(date, activity, clock_in, clock_out, description)
         except ValueError as e:
             logger.error(f"Value error in submit_logbook: {str(e)}")
             print_error(str(e))
             return {"error": str(e)}
-        except Exception as e:
-            logger.error(f"Error in submit_logbook: {str(e)}")
-            print_error(f"Unexpected error: {str(e)}")
-            return {"error": f"Unexpected error: {str(e)}"}
+        
+        return submit_entry(entry, force, snapshot)
+    except ReauthenticationError:
+        raise
     except Exception as e:
         logger.error(f"Unexpected error in submit_logbook: {str(e)}")
         print_error(f"Unexpected error: {str(e)}")
         return {"error": f"Unexpected error: {str(e)}"}
+
+def submit_entry(entry, force=False, snapshot=None):
+    try:
+        logger.debug(f"Formatted data: date={entry.iso_date}, clock_in={entry.clock_in_12hr}, clock_out={entry.clock_out_12hr}")
+        
+        if snapshot is None:
+            snapshot = LogbookSnapshot.fetch()
+        
+        submission, error = prepare_submission(entry, force, snapshot)
+        if error:
+            return error
+        payload = submission['payload']
+        entry_id = submission['entry_id']
+        
+        logger.debug(f"Submitting payload: {payload}")
+        # Overwriting a known entry ID is idempotent; creating a new entry is not.
+        response = make_api_request(
+            'POST', LOGBOOK_STUDENT_SAVE_URL, data=payload,
+            idempotent=entry_id != EMPTY_ENTRY_ID
+        )
+        
+        if not response:
+            error_msg = "Failed to submit logbook entry"
+            logger.error(error_msg)
+            print_error(error_msg)
+            return {"error": "Failed to submit logbook entry"}
+            
+        try:
+            return handle_submission_result(response.json(), submission, snapshot)
+        except json.JSONDecodeError as e:
+            error_msg = f"Failed to parse response: {response.text[:500]}... Error: {str(e)}"
+            logger.error(error_msg)
+            print_error(error_msg)
+            return {"error": "Failed to parse response", "raw": response.text}
+    except ReauthenticationError:
+        raise
+    except Exception as e:
+        logger.error(f"Error in submit_entry for {entry.date}: {str(e)}")
+        print_error(f"Unexpected error: {str(e)}")
+        return {"error": f"Unexpected error: {str(e)}"}
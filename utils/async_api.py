@@ -0,0 +1,242 @@
+import asyncio
+import json
+import time
+import aiohttp
+from utils.api import (
+    LogbookSnapshot, prepare_request_params, get_rate_limiter, get_retry_policy,
+    get_session_generation, refresh_session, parse_months_data, prepare_submission, handle_submission_result
+)
+from utils.cookies import record_session_expiry, apply_response_cookies, morsel_expiry
+from utils.config import get_http_settings, get_submission_workers
+from utils.retry import parse_retry_after
+from utils.entries import LogEntry
+from utils.utils import session_store, logger
+from utils.constants import (
+    BASE_URL, REFERER_URL, LOGBOOK_GET_MONTHS_URL, LOGBOOK_GET_LOGBOOK_URL,
+    LOGBOOK_STUDENT_SAVE_URL, EMPTY_ENTRY_ID, PLAN_OVERWRITE
+)
+from utils.display import print_error, print_success, print_warning
+
+class AsyncLogbookClient:
+    """asyncio counterpart of utils.api; shares cookies, rate limiters and retry budgets with it."""
+
+    def __init__(self, settings=None):
+        self._settings = settings or get_http_settings()
+        self._session = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        if self._session is not None:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self._settings['pool_maxsize'],
+            limit_per_host=self._settings['pool_maxsize']
+        )
+        timeout = aiohttp.ClientTimeout(
+            sock_connect=self._settings['connect_timeout'],
+            sock_read=self._settings['read_timeout']
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            # Cookies come from the session store; response cookies are merged there, not here.
+            cookie_jar=aiohttp.DummyCookieJar(),
+            headers={'X-Requested-With': 'XMLHttpRequest', 'Referer': REFERER_URL}
+        )
+        logger.info("Async HTTP session opened")
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            logger.info("Async HTTP session closed")
+
+    async def _wait_before_retry(self, policy, attempt, reason, retry_after=None):
+        delay = policy.get_delay(attempt, retry_after)
+        logger.warning(f"{reason}; retrying in {delay:.1f}s (attempt {attempt + 1}/{policy.max_attempts})")
+        await asyncio.sleep(delay)
+
+    async def request(self, method, url, data=None, params=None, idempotent=None, retry_on_403=True):
+        if self._session is None:
+            await self.open()
+
+        limiter = get_rate_limiter(url)
+        policy = get_retry_policy(url)
+        if idempotent is None:
+            idempotent = method.lower() == 'get' or url != LOGBOOK_STUDENT_SAVE_URL
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                # May start a browser login, so keep it off the event loop.
+                generation = get_session_generation()
+                cookies, user_agent = await asyncio.to_thread(prepare_request_params)
+                headers = {'User-Agent': user_agent}
+                if method.lower() == 'post':
+                    headers['Content-Type'] = 'application/x-www-form-urlencoded; charset=UTF-8'
+                    headers['Origin'] = BASE_URL
+
+                wait = limiter.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                started = time.perf_counter()
+                async with self._session.request(
+                    method.upper(), url, data=data, params=params, headers=headers, cookies=cookies
+                ) as response:
+                    body = await response.text()
+                    status = response.status
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    cookie_updates = [
+                        (morsel.key, morsel.value, morsel_expiry(morsel)) for morsel in response.cookies.values()
+                    ]
+                latency = time.perf_counter() - started
+                limiter.record_response(latency=latency, status_code=status)
+
+                if status == 403 and retry_on_403:
+                    logger.warning("Session expired (403 error). Attempting to re-login.")
+                    print_warning("Session expired. Logging in again.")
+                    record_session_expiry()
+                    await asyncio.to_thread(refresh_session, generation)
+                    retry_on_403 = False
+                    continue
+
+                if status != 200:
+                    if policy.is_retryable_status(status, idempotent) and policy.allow_retry(attempt):
+                        await self._wait_before_retry(policy, attempt, f"API request returned {status}", retry_after)
+                        continue
+                    logger.error(f"API request failed with status code {status} - URL: {url}")
+                    logger.error(f"Response: {body[:500]}...")
+                    return None
+
+                session_store.mark_accepted()
+                apply_response_cookies(cookie_updates)
+                return body
+            except aiohttp.ClientConnectorError:
+                # The connection was never established, so even non-idempotent requests are safe to repeat.
+                limiter.record_response(failed=True)
+                if policy.allow_retry(attempt):
+                    await self._wait_before_retry(policy, attempt, f"Connection error for {url}")
+                    continue
+                logger.error(f"Connection error for {url}")
+                return None
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                limiter.record_response(failed=True)
+                if idempotent and policy.allow_retry(attempt):
+                    await self._wait_before_retry(policy, attempt, f"API request failed for {url}: {str(e) or type(e).__name__}")
+                    continue
+                logger.error(f"API request failed for {url}: {str(e) or type(e).__name__}")
+                return None
+
+    async def request_json(self, method, url, **kwargs):
+        body = await self.request(method, url, **kwargs)
+        if body is None:
+            return None
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            logger.error(f"Invalid JSON response from {url}: {body[:500]}... Error: {str(e)}")
+            return None
+
+    async def get_logbook_months(self, logbook_id=""):
+        logger.info("Retrieving logbook months (async)")
+        params = {'logBookId': logbook_id} if logbook_id else None
+        data = await self.request_json('GET', LOGBOOK_GET_MONTHS_URL, params=params)
+        months_data = parse_months_data(data)
+        if not months_data:
+            logger.error("Failed to retrieve logbook months")
+            return None
+        logger.info(f"Successfully retrieved {len(months_data)} months")
+        return months_data
+
+    async def get_logbook_entries(self, logbook_header_id):
+        if not logbook_header_id:
+            return {"error": "Invalid logbook header ID"}
+        data = await self.request_json(
+            'POST', LOGBOOK_GET_LOGBOOK_URL, data={'logBookHeaderID': logbook_header_id}
+        )
+        if not isinstance(data, dict):
+            return {"error": "Failed to retrieve logbook entries"}
+        return data
+
+    async def fetch_snapshot(self):
+        months_data = await self.get_logbook_months()
+        if not months_data:
+            return None
+
+        months = list(months_data.keys())
+        results = await asyncio.gather(*(
+            self.get_logbook_entries(months_data[month]['logBookHeaderID']) for month in months
+        ))
+
+        entries_by_month = {}
+        for month, entries_data in zip(months, results):
+            if "error" in entries_data:
+                logger.warning(f"Could not fetch entries for month {month}; it will be treated as unavailable")
+                continue
+            entries_by_month[month] = entries_data
+
+        return LogbookSnapshot(months_data, entries_by_month)
+
+    async def submit_logbook(self, date, activity, clock_in, clock_out, description, force=False, snapshot=None):
+        try:
+            entry = LogEntry.create(date, activity, clock_in, clock_out, description)
+        except ValueError as e:
+            logger.error(f"Value error in async submit_logbook: {str(e)}")
+            return {"error": str(e)}
+        return await self.submit_entry(entry, force, snapshot)
+
+    async def submit_entry(self, entry, force=False, snapshot=None):
+        try:
+            if snapshot is None:
+                snapshot = await self.fetch_snapshot()
+                if snapshot is None:
+                    return {"error": "Failed to retrieve logbook snapshot"}
+
+            submission, error = prepare_submission(entry, force, snapshot)
+            if error:
+                return error
+
+            result = await self.request_json(
+                'POST', LOGBOOK_STUDENT_SAVE_URL, data=submission['payload'],
+                idempotent=submission['entry_id'] != EMPTY_ENTRY_ID
+            )
+            if result is None:
+                return {"error": "Failed to submit logbook entry"}
+            return handle_submission_result(result, submission, snapshot)
+        except ValueError as e:
+            logger.error(f"Value error in async submit_entry: {str(e)}")
+            return {"error": str(e)}
+
+    async def submit_entries(self, items, snapshot, concurrency=None):
+        # items are submission plan entries; all of them must belong to months that are
+        # already available, callers handle month ordering.
+        semaphore = asyncio.Semaphore(concurrency or get_submission_workers())
+
+        async def submit_one(item):
+            async with semaphore:
+                response = await self.submit_entry(
+                    item['entry'], force=item['action'] == PLAN_OVERWRITE, snapshot=snapshot
+                )
+            if "error" in response:
+                print_error(f"Logbook submission failed for {item['date']}: {response['error']}")
+                return False
+            print_success(f"Logbook entry for {item['date']} submitted successfully")
+            return True
+
+        results = await asyncio.gather(*(submit_one(item) for item in items))
+        return sum(1 for ok in results if ok)
+
+async def fetch_snapshot_async():
+    async with AsyncLogbookClient() as client:
+        return await client.fetch_snapshot()
+
+def fetch_snapshot():
+    return asyncio.run(fetch_snapshot_async())
@@ -0,0 +1,120 @@
+import atexit
+import threading
+import time
+from utils.config import get_browser_pool_settings
+from utils.utils import logger
+
+class BrowserPool:
+    """Keeps signed-in browsers warm between logins, keyed by account, and quits idle ones."""
+
+    def __init__(self, factory, max_idle, idle_timeout):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._closed = False
+        self._reaper = None
+        self.max_idle = max(int(max_idle), 1)
+        self.idle_timeout = max(float(idle_timeout), 1.0)
+
+    def _idle_count(self):
+        return sum(len(drivers) for drivers in self._idle.values())
+
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error closing pooled browser: {str(e)}")
+
+    def acquire(self, key=None):
+        while True:
+            with self._lock:
+                drivers = self._idle.get(key) or []
+                entry = drivers.pop() if drivers else None
+            if entry is None:
+                break
+            driver, _ = entry
+            if self._is_alive(driver):
+                logger.info("Reusing warm browser from pool")
+                return driver, True
+            logger.info("Discarding dead pooled browser")
+            self._quit(driver)
+
+        logger.info("No warm browser available; starting a new one")
+        return self._factory(), False
+
+    def release(self, driver, key=None, healthy=True):
+        if driver is None:
+            return
+        with self._lock:
+            if healthy and not self._closed and self._idle_count() < self.max_idle:
+                self._idle.setdefault(key, []).append((driver, time.monotonic()))
+                self._ensure_reaper()
+                logger.info("Browser returned to pool")
+                return
+        self._quit(driver)
+
+    def evict_idle(self):
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            for key, drivers in self._idle.items():
+                keep = []
+                for driver, released_at in drivers:
+                    if now - released_at >= self.idle_timeout:
+                        expired.append(driver)
+                    else:
+                        keep.append((driver, released_at))
+                self._idle[key] = keep
+        for driver in expired:
+            logger.info("Closing idle pooled browser")
+            self._quit(driver)
+        return len(expired)
+
+    def _ensure_reaper(self):
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+        self._reaper = threading.Thread(target=self._reap, name="nullog-browser-reaper", daemon=True)
+        self._reaper.start()
+
+    def _reap(self):
+        while True:
+            time.sleep(min(self.idle_timeout / 2, 30))
+            self.evict_idle()
+            with self._lock:
+                if self._closed or self._idle_count() == 0:
+                    self._reaper = None
+                    return
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            drivers = [driver for entries in self._idle.values() for driver, _ in entries]
+            self._idle = {}
+        for driver in drivers:
+            self._quit(driver)
+        if drivers:
+            logger.info(f"Closed {len(drivers)} pooled browser(s)")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_browser_pool(factory):
+    global _pool
+    settings = get_browser_pool_settings()
+    if settings['size'] <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(factory, settings['size'], settings['idle_timeout'])
+            atexit.register(_pool.close)
+            logger.info(f"Browser pool enabled: {settings['size']} warm browser(s), {settings['idle_timeout']}s idle timeout")
+        return _pool
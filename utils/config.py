@@ -1,16 +1,126 @@
 import os
 from dotenv import load_dotenv
 import getpass
+from utils.constants import (
+    HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE,
+    DEFAULT_SUBMISSION_WORKERS, MAX_SUBMISSION_WORKERS, WRITE_RATE_LIMIT, WRITE_RATE_BURST,
+    READ_RATE_LIMIT, READ_RATE_BURST, ADAPTIVE_THROTTLE, WRITE_RATE_MIN, WRITE_RATE_MAX,
+    READ_RATE_MIN, READ_RATE_MAX, ADAPTIVE_INCREASE_STEP, ADAPTIVE_DECREASE_FACTOR,
+    ADAPTIVE_LATENCY_THRESHOLD, READ_RETRY_ATTEMPTS, READ_RETRY_BASE_DELAY, READ_RETRY_MAX_DELAY,
+    READ_RETRY_BUDGET, WRITE_RETRY_ATTEMPTS, WRITE_RETRY_BASE_DELAY, WRITE_RETRY_MAX_DELAY,
+    WRITE_RETRY_BUDGET, BROWSER_POOL_SIZE, BROWSER_IDLE_TIMEOUT, SESSION_KEEPALIVE_INTERVAL,
+    SESSION_REFRESH_MARGIN
+)
 
 load_dotenv()
 
+_credentials = None
+
 def get_credentials():
-    username = os.getenv("USER_EMAIL_NLG")
-    password = os.getenv("USER_PASSWORD_NLG")
+    # Prompted values are kept for the rest of the run, so a later re-login never asks again.
+    global _credentials
+    cached_username, cached_password = _credentials or (None, None)
+    username = os.getenv("USER_EMAIL_NLG") or cached_username
+    password = os.getenv("USER_PASSWORD_NLG") or cached_password
     
     if not username:
         username = input("Enter email: ")
     if not password:
         password = getpass.getpass("Enter password: ")
     
+    _credentials = (username, password)
     return username, password
+
+def credentials_available():
+    # True when get_credentials() can return without reading stdin.
+    cached_username, cached_password = _credentials or (None, None)
+    return bool(
+        (os.getenv("USER_EMAIL_NLG") or cached_username)
+        and (os.getenv("USER_PASSWORD_NLG") or cached_password)
+    )
+
+def _get_env_number(name, default, cast):
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return cast(value.strip())
+    except ValueError:
+        return default
+
+def get_http_settings():
+    return {
+        'connect_timeout': _get_env_number("HTTP_CONNECT_TIMEOUT", HTTP_CONNECT_TIMEOUT, float),
+        'read_timeout': _get_env_number("HTTP_READ_TIMEOUT", HTTP_READ_TIMEOUT, float),
+        'pool_connections': _get_env_number("HTTP_POOL_CONNECTIONS", HTTP_POOL_CONNECTIONS, int),
+        'pool_maxsize': max(
+            _get_env_number("HTTP_POOL_MAXSIZE", HTTP_POOL_MAXSIZE, int),
+            get_submission_workers()
+        ),
+    }
+
+def get_submission_workers():
+    workers = _get_env_number("SUBMISSION_WORKERS", DEFAULT_SUBMISSION_WORKERS, int)
+    return min(max(workers, 1), MAX_SUBMISSION_WORKERS)
+
+def _get_env_bool(name, default):
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() == "true"
+
+def get_login_settings():
+    return {
+        'headless': _get_env_bool("HEADLESS_LOGIN", False),
+    }
+
+def get_csv_settings():
+    return {
+        'stream': _get_env_bool("STREAM_CSV", False),
+    }
+
+def get_browser_pool_settings():
+    return {
+        'size': _get_env_number("BROWSER_POOL_SIZE", BROWSER_POOL_SIZE, int),
+        'idle_timeout': _get_env_number("BROWSER_IDLE_TIMEOUT", BROWSER_IDLE_TIMEOUT, float),
+    }
+
+def get_session_refresh_settings():
+    return {
+        'interval': _get_env_number("SESSION_KEEPALIVE_INTERVAL", SESSION_KEEPALIVE_INTERVAL, float),
+        'margin': _get_env_number("SESSION_REFRESH_MARGIN", SESSION_REFRESH_MARGIN, float),
+    }
+
+def get_rate_limit_settings(write=False):
+    prefix = "WRITE" if write else "READ"
+    defaults = {
+        'rate': WRITE_RATE_LIMIT if write else READ_RATE_LIMIT,
+        'burst': WRITE_RATE_BURST if write else READ_RATE_BURST,
+        'min_rate': WRITE_RATE_MIN if write else READ_RATE_MIN,
+        'max_rate': WRITE_RATE_MAX if write else READ_RATE_MAX,
+    }
+    return {
+        'rate': _get_env_number(f"{prefix}_RATE_LIMIT", defaults['rate'], float),
+        'burst': _get_env_number(f"{prefix}_RATE_BURST", defaults['burst'], int),
+        'adaptive': _get_env_bool("ADAPTIVE_THROTTLE", ADAPTIVE_THROTTLE),
+        'min_rate': _get_env_number(f"{prefix}_RATE_MIN", defaults['min_rate'], float),
+        'max_rate': _get_env_number(f"{prefix}_RATE_MAX", defaults['max_rate'], float),
+        'increase_step': _get_env_number("ADAPTIVE_INCREASE_STEP", ADAPTIVE_INCREASE_STEP, float),
+        'decrease_factor': _get_env_number("ADAPTIVE_DECREASE_FACTOR", ADAPTIVE_DECREASE_FACTOR, float),
+        'latency_threshold': _get_env_number("ADAPTIVE_LATENCY_THRESHOLD", ADAPTIVE_LATENCY_THRESHOLD, float),
+    }
+
+def get_retry_settings(write=False):
+    prefix = "WRITE" if write else "READ"
+    defaults = {
+        'max_attempts': WRITE_RETRY_ATTEMPTS if write else READ_RETRY_ATTEMPTS,
+        'base_delay': WRITE_RETRY_BASE_DELAY if write else READ_RETRY_BASE_DELAY,
+        'max_delay': WRITE_RETRY_MAX_DELAY if write else READ_RETRY_MAX_DELAY,
+        'budget': WRITE_RETRY_BUDGET if write else READ_RETRY_BUDGET,
+    }
+    return {
+        'max_attempts': _get_env_number(f"{prefix}_RETRY_ATTEMPTS", defaults['max_attempts'], int),
+        'base_delay': defaults['base_delay'],
+        'max_delay': defaults['max_delay'],
+        'budget': _get_env_number(f"{prefix}_RETRY_BUDGET", defaults['budget'], int),
+    }
@@ -1,12 +1,19 @@
 COOKIES_DIR = "cookies"
 COOKIES_FILE = "cookies.pkl"
+CACHE_DIR = "cache"
+DRIVER_CACHE_FILE = "chromedriver.json"
+UPDATE_CACHE_FILE = "update_check.json"
+SESSION_STATS_FILE = "session_stats.json"
 
-BASE_URL = "https://activity-enrichment.apps.binus.ac.id"
+LOGBOOK_HOST = "activity-enrichment.apps.binus.ac.id"
+BASE_URL = f"https://{LOGBOOK_HOST}"
 LOGIN_URL = "https://enrichment.apps.binus.ac.id/Login/Student/Login"
+MICROSOFT_LOGIN_HOST = "login.microsoftonline.com"
 LOGBOOK_GET_MONTHS_URL = f"{BASE_URL}/LogBook/GetMonths"
 LOGBOOK_GET_LOGBOOK_URL = f"{BASE_URL}/LogBook/GetLogBook"
 LOGBOOK_STUDENT_SAVE_URL = f"{BASE_URL}/LogBook/StudentSave"
 REFERER_URL = f"{BASE_URL}/LearningPlan/StudentIndex"
+LATEST_VERSION_URL = "https://raw.githubusercontent.com/kangwijen/nullog/refs/heads/main/VERSION"
 
 XPATH_MS_LOGIN_BTN = '//*[@id="btnLogin"]'
 XPATH_EMAIL_INPUT = '//*[@id="i0116"]'
@@ -21,7 +28,112 @@ XPATH_LOGBOOK_NAV = '//*[@id="main-content"]/div[1]/div/div/ul/li[2]'
 XPATH_ODD_SEMESTER_DROPDOWN = '//*[@id="user-content"]/div[3]/div'
 XPATH_ODD_SEMESTER_ITEM = '//*[@id="user-content"]/div[3]/div/div[2]/div[2]'
 
+# Login waits (seconds)
+LOGIN_WAIT_TIMEOUT = 20
+LOGIN_POLL_INTERVAL = 0.2
+NETWORK_IDLE_QUIET_PERIOD = 0.5
+
+# Browser pool
+BROWSER_POOL_SIZE = 0
+BROWSER_IDLE_TIMEOUT = 300
+
+# Session lifetime learning (seconds)
+DEFAULT_SESSION_LIFETIME = 15 * 60
+MIN_SESSION_LIFETIME = 60
+SESSION_LIFETIME_SAMPLES = 20
+SESSION_LIFETIME_SAFETY = 0.9
+SESSION_EXPIRY_PRECISION = 300
+SESSION_ACCEPTED_GRACE = 300
+IGNORED_COOKIE_PREFIXES = ("_ga", "_gid", "_gat", "_fbp", "_hj", "ai_")
+COOKIE_FLUSH_INTERVAL = 30
+
+# Update check (seconds)
+UPDATE_CHECK_TTL = 6 * 60 * 60
+UPDATE_RETRY_AFTER_FAILURE = 60 * 60
+UPDATE_CHECK_TIMEOUT = 3
+
+# Startup import time above which a warning is logged (seconds)
+IMPORT_TIME_BUDGET = 0.5
+
+# Background session refresher (seconds); an interval of 0 disables it
+SESSION_KEEPALIVE_INTERVAL = 0
+SESSION_REFRESH_MARGIN = 120
+
+# Fast (headless) login profile
+LOGIN_WINDOW_SIZE = "1280,800"
+FAST_LOGIN_ARGUMENTS = [
+    "--disable-extensions",
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--mute-audio",
+    "--blink-settings=imagesEnabled=false",
+]
+BLOCKED_RESOURCE_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.css",
+    "*.mp4", "*.webm", "*.mp3",
+]
+
 DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36'
 
+EMPTY_ENTRY_ID = '00000000-0000-0000-0000-000000000000'
+
 WEEKDAY_SATURDAY = 5
 WEEKDAY_SUNDAY = 6
+
+# HTTP client
+HTTP_CONNECT_TIMEOUT = 5
+HTTP_READ_TIMEOUT = 30
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 10
+
+# Rate limits (requests per second, burst size)
+WRITE_RATE_LIMIT = 1.0
+WRITE_RATE_BURST = 1
+READ_RATE_LIMIT = 5.0
+READ_RATE_BURST = 5
+
+# Adaptive (AIMD) throttling
+ADAPTIVE_THROTTLE = True
+WRITE_RATE_MIN = 0.2
+WRITE_RATE_MAX = 4.0
+READ_RATE_MIN = 0.5
+READ_RATE_MAX = 20.0
+ADAPTIVE_INCREASE_STEP = 0.1
+ADAPTIVE_DECREASE_FACTOR = 0.5
+ADAPTIVE_LATENCY_THRESHOLD = 5.0
+ADAPTIVE_LATENCY_SPIKE_FACTOR = 2.5
+# A spike must also exceed the baseline by this fraction of the latency threshold.
+ADAPTIVE_LATENCY_SPIKE_MIN_FRACTION = 0.2
+ADAPTIVE_LATENCY_SMOOTHING = 0.2
+ADAPTIVE_DECREASE_COOLDOWN = 1.0
+
+# Retries
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+UNPROCESSED_STATUS_CODES = (429, 503)
+READ_RETRY_ATTEMPTS = 4
+READ_RETRY_BASE_DELAY = 0.5
+READ_RETRY_MAX_DELAY = 10.0
+READ_RETRY_BUDGET = 30
+WRITE_RETRY_ATTEMPTS = 3
+WRITE_RETRY_BASE_DELAY = 1.0
+WRITE_RETRY_MAX_DELAY = 15.0
+WRITE_RETRY_BUDGET = 20
+
+# Submission
+DEFAULT_SUBMISSION_WORKERS = 1
+MAX_SUBMISSION_WORKERS = 8
+
+# Submission plan actions
+PLAN_CREATE = "create"
+PLAN_OVERWRITE = "overwrite"
+PLAN_SKIP = "skip"
+PLAN_BLOCKED = "blocked"
+PLAN_UNCHANGED = "unchanged"
+PLAN_WRITE_ACTIONS = (PLAN_CREATE, PLAN_OVERWRITE)
@@ -1,34 +1,189 @@
-from utils.utils import load_data_securely, logger
-from utils.constants import DEFAULT_USER_AGENT
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from http.cookies import SimpleCookie, CookieError
+from utils.utils import session_store, load_json_cache, save_json_cache, logger
+from utils.constants import (
+    DEFAULT_USER_AGENT, SESSION_STATS_FILE, DEFAULT_SESSION_LIFETIME, MIN_SESSION_LIFETIME,
+    SESSION_LIFETIME_SAMPLES, SESSION_LIFETIME_SAFETY, SESSION_EXPIRY_PRECISION, SESSION_ACCEPTED_GRACE,
+    IGNORED_COOKIE_PREFIXES
+)
 from datetime import datetime, timezone, timedelta
 
-def load_cookies(max_age_minutes=15):
+_session_stats = None
+_session_stats_lock = threading.Lock()
+
+def _parse_timestamp(value):
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    # Normalize to aware UTC if saved as naive UTC
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+def _is_session_cookie(name):
+    return not (name or "").startswith(IGNORED_COOKIE_PREFIXES)
+
+def get_session_start(data):
+    # The session starts at login and restarts whenever the server renews its cookies.
+    generated_at = _parse_timestamp(data.get("generated_at"))
+    refreshed_at = session_store.refreshed_at
+    if generated_at is None:
+        return None
+    if refreshed_at and refreshed_at > generated_at:
+        return refreshed_at
+    return generated_at
+
+def get_cookie_expiry(cookies):
+    # Earliest expiry the server declared for a session cookie; analytics cookies are ignored.
+    expiries = [
+        cookie["expiry"] for cookie in cookies
+        if isinstance(cookie, dict) and cookie.get("expiry") and _is_session_cookie(cookie.get("name"))
+    ]
+    if not expiries:
+        return None
+    return datetime.fromtimestamp(min(expiries), tz=timezone.utc)
+
+def _load_session_stats():
+    global _session_stats
+    with _session_stats_lock:
+        if _session_stats is None:
+            stats = load_json_cache(SESSION_STATS_FILE)
+            lifetimes = stats.get("lifetimes") if isinstance(stats, dict) else None
+            if not isinstance(lifetimes, list):
+                lifetimes = []
+            _session_stats = {
+                "lifetimes": [float(v) for v in lifetimes if isinstance(v, (int, float)) and v > 0],
+                "last_recorded_start": None,
+            }
+        return _session_stats
+
+def estimate_session_lifetime():
+    # Lower quartile of the observed lifetimes, scaled down so sessions are renewed before they expire.
+    lifetimes = sorted(_load_session_stats()["lifetimes"])
+    if not lifetimes:
+        return None
+    lower_quartile = lifetimes[(len(lifetimes) - 1) // 4]
+    return max(lower_quartile * SESSION_LIFETIME_SAFETY, MIN_SESSION_LIFETIME)
+
+def record_session_expiry():
+    # Called when the server rejects the stored session with a 403.
+    try:
+        data = session_store.get_data()
+        if not isinstance(data, dict):
+            return None
+        
+        now = datetime.now(timezone.utc)
+        start = get_session_start(data)
+        accepted_at = session_store.accepted_at
+        if start is None or accepted_at is None or (now - accepted_at).total_seconds() > SESSION_EXPIRY_PRECISION:
+            logger.debug("Session expired without a recent successful request; not recording its lifetime")
+            return None
+        
+        stats = _load_session_stats()
+        lifetime = (now - start).total_seconds()
+        with _session_stats_lock:
+            # Parallel requests can all hit the same expiry; count it once.
+            if stats["last_recorded_start"] == start:
+                return None
+            stats["last_recorded_start"] = start
+            stats["lifetimes"] = (stats["lifetimes"] + [lifetime])[-SESSION_LIFETIME_SAMPLES:]
+            save_json_cache(SESSION_STATS_FILE, {"lifetimes": stats["lifetimes"]})
+            samples = len(stats["lifetimes"])
+        logger.info(f"Observed session lifetime of {lifetime / 60:.1f} minutes ({samples} sample(s))")
+        return lifetime
+    except Exception as e:
+        logger.warning(f"Could not record session lifetime: {str(e)}")
+        return None
+
+def morsel_expiry(morsel):
+    if morsel['max-age']:
+        try:
+            return time.time() + int(morsel['max-age'])
+        except ValueError:
+            return None
+    if morsel['expires']:
+        try:
+            return parsedate_to_datetime(morsel['expires']).timestamp()
+        except (TypeError, ValueError):
+            return None
+    return None
+
+def parse_set_cookie_headers(headers):
+    # Raw Set-Cookie values to (name, value, expiry) updates. Unlike a cookie jar, this keeps
+    # cookies with a past expiry, which is how the server deletes them.
+    updates = []
+    for header in headers:
+        parsed = SimpleCookie()
+        try:
+            parsed.load(header)
+        except CookieError as e:
+            logger.debug(f"Ignoring unparsable Set-Cookie header: {str(e)}")
+            continue
+        updates.extend((morsel.key, morsel.value, morsel_expiry(morsel)) for morsel in parsed.values())
+    return updates
+
+def apply_response_cookies(updates):
+    # updates are (name, value, expiry epoch or None) tuples taken from Set-Cookie headers.
+    session_updates = [update for update in updates if _is_session_cookie(update[0])]
+    if not session_updates:
+        return False
+    if session_store.merge_cookies(session_updates):
+        session_store.mark_refreshed()
+        session_store.flush()
+        logger.debug(f"Server renewed {len(session_updates)} session cookie(s)")
+        return True
+    return False
+
+def get_session_deadline(data, max_age_minutes=None):
+    start = get_session_start(data)
+    if start is None:
+        return None
+    if max_age_minutes is not None:
+        return start + timedelta(minutes=max_age_minutes)
+    
+    lifetime = estimate_session_lifetime()
+    expiry = get_cookie_expiry(data.get("cookies") or [])
+    if lifetime is None and expiry is None:
+        lifetime = DEFAULT_SESSION_LIFETIME
+    deadline = start + timedelta(seconds=lifetime) if lifetime is not None else expiry
+    
+    # A request accepted at age X proves the session lives at least X, so the estimate never
+    # ends the window within a grace period of the last accepted request.
+    accepted_at = session_store.accepted_at
+    if accepted_at is not None and accepted_at > start:
+        deadline = max(deadline, accepted_at + timedelta(seconds=SESSION_ACCEPTED_GRACE))
+    # The cookie expiry the server declared is a hard limit.
+    if expiry is not None:
+        deadline = min(deadline, expiry)
+    return deadline
+
+def cookies_expire_within(data, seconds):
+    expiry = get_cookie_expiry(data.get("cookies") or [])
+    return expiry is not None and (expiry - datetime.now(timezone.utc)).total_seconds() <= seconds
+
+def load_cookies(max_age_minutes=None, check_freshness=True):
     try:
-        data = load_data_securely()
+        data = session_store.get_data()
         
         if data:
             if isinstance(data, dict) and "cookies" in data:
-                # Freshness guard: ensure cookies are recent
-                generated_at_str = data.get("generated_at")
-                if generated_at_str:
-                    try:
-                        generated_at = datetime.fromisoformat(generated_at_str)
-                        # Normalize to aware UTC if saved as naive UTC
-                        if generated_at.tzinfo is None:
-                            generated_at = generated_at.replace(tzinfo=timezone.utc)
-                        age = datetime.now(timezone.utc) - generated_at
-                        if age <= timedelta(minutes=max_age_minutes):
-                            logger.info("Loaded fresh cookies from secure storage")
-                            return data["cookies"]
-                        else:
-                            logger.warning("Stored cookies are stale; forcing fresh login")
-                            return None
-                    except Exception:
-                        logger.warning("Invalid generated_at timestamp; treating cookies as stale")
-                        return None
-                else:
-                    logger.warning("No generated_at timestamp found; treating cookies as stale")
+                if not check_freshness:
+                    return data["cookies"]
+                # Freshness guard: an explicit max age wins, otherwise the learned session lifetime
+                deadline = get_session_deadline(data, max_age_minutes)
+                if deadline is None:
+                    logger.warning("No valid generated_at timestamp found; treating cookies as stale")
                     return None
+                if datetime.now(timezone.utc) < deadline:
+                    logger.info("Loaded fresh cookies from secure storage")
+                    return data["cookies"]
+                logger.warning("Stored cookies are past their expected lifetime")
+                return None
             else:
                 logger.warning("Data format is not as expected, returning raw data")
                 return data
@@ -41,9 +196,19 @@ def load_cookies(max_age_minutes=15):
         print(f"Error loading cookies: {str(e)}")
         return None
 
+def load_session_semester():
+    try:
+        data = session_store.get_data()
+        if data and isinstance(data, dict):
+            return data.get("is_odd_semester")
+        return None
+    except Exception as e:
+        logger.error(f"Error loading session semester: {str(e)}")
+        return None
+
 def load_user_agent():
     try:
-        data = load_data_securely()
+        data = session_store.get_data()
         
         if data and isinstance(data, dict) and "user_agent" in data:
             logger.info("Successfully loaded user agent from secure storage")
@@ -56,18 +56,12 @@ def display_csv_entries(entries):
         
     table_data = []
     for entry in entries:
-        try:
-            date_obj = datetime.strptime(entry['date'], '%Y-%m-%d')
-            formatted_date = date_obj.strftime('%d %b %Y')
-        except ValueError:
-            formatted_date = entry['date']
-            
         table_data.append([
-            formatted_date,
-            entry['activity'],
-            entry['clock_in'],
-            entry['clock_out'],
-            entry['description']
+            entry.date_obj.strftime('%d %b %Y'),
+            entry.activity,
+            entry.clock_in,
+            entry.clock_out,
+            entry.description
         ])
     
     print_table(
@@ -124,3 +118,39 @@ def display_available_months(completion_status):
         ["Month #", "Month", "Year", "Complete", "Fill Status", "Submit Status", "Availability"],
         "Available Months in Logbook"
     )
+
+def display_submission_plan(plan):
+    if not plan:
+        print_warning("Submission plan is empty")
+        return
+    
+    action_colors = {
+        "create": Fore.GREEN,
+        "overwrite": Fore.YELLOW,
+        "unchanged": Fore.BLUE,
+        "skip": Fore.CYAN,
+        "blocked": Fore.RED
+    }
+    
+    table_data = []
+    counts = {}
+    for item in plan:
+        entry = item['entry']
+        action = item['action']
+        counts[action] = counts.get(action, 0) + 1
+        color = action_colors.get(action, "")
+        table_data.append([
+            entry.date_obj.strftime('%d %b %Y'),
+            f"{color}{action.upper()}{Style.RESET_ALL}",
+            entry.activity,
+            entry.clock_in,
+            entry.clock_out,
+            item['reason']
+        ])
+    
+    print_table(
+        table_data,
+        ["Date", "Action", "Activity", "Clock In", "Clock Out", "Reason"],
+        "Submission Plan"
+    )
+    print_info("Plan summary: " + ", ".join(f"{count} {action}" for action, count in counts.items()))
@@ -0,0 +1,104 @@
+from datetime import datetime
+
+OFF_VALUE = "OFF"
+
+def _format_12hour(minutes):
+    hour, minute = divmod(minutes, 60)
+    period = "am" if hour < 12 else "pm"
+    if hour == 0:
+        hour = 12
+    elif hour > 12:
+        hour -= 12
+    return f"{hour:02d}:{minute:02d} {period}"
+
+# Every valid "HH:MM" (24-hour) value, built once at import; OFF maps to None.
+TIME_MINUTES = {f"{m // 60:02d}:{m % 60:02d}": m for m in range(24 * 60)}
+TIME_MINUTES[OFF_VALUE] = None
+TIME_12HOUR = [_format_12hour(m) for m in range(24 * 60)]
+TIME_12HOUR_MINUTES = {text: m for m, text in enumerate(TIME_12HOUR)}
+
+def time_to_minutes(time_str):
+    # "HH:MM" (24-hour) to minutes after midnight; None for OFF.
+    try:
+        return TIME_MINUTES[time_str]
+    except KeyError:
+        raise ValueError(f"Invalid time '{time_str}'; use HH:MM (24-hour) or OFF")
+
+def minutes_to_12hour(minutes):
+    if minutes is None:
+        return OFF_VALUE
+    return TIME_12HOUR[minutes]
+
+def parse_12hour(value):
+    # Server clock string ("09:00 am", "9:00 AM" or OFF) to minutes after midnight; None for OFF.
+    text = ''.join((value or '').split()).lower()
+    if text == OFF_VALUE.lower():
+        return None
+    if len(text) == 6:
+        text = '0' + text
+    try:
+        return TIME_12HOUR_MINUTES[f"{text[:5]} {text[5:]}"]
+    except KeyError:
+        raise ValueError(f"Invalid server time '{value}'")
+
+class LogEntry:
+    """A validated logbook row, parsed once and shared by the parser, planner, display and API.
+
+    Dates and times are converted when the entry is created, so later stages never parse them again.
+    """
+
+    __slots__ = (
+        'date', 'date_obj', 'iso_date', 'month_key', 'weekday', 'activity', 'clock_in', 'clock_out',
+        'description', 'clock_in_minutes', 'clock_out_minutes', 'clock_in_12hr', 'clock_out_12hr'
+    )
+
+    def __init__(self, date_obj, activity, clock_in, clock_out, description):
+        self.date_obj = date_obj
+        self.date = date_obj.strftime('%Y-%m-%d')
+        self.iso_date = f"{self.date}T00:00:00"
+        self.month_key = (date_obj.year, date_obj.month)
+        self.weekday = date_obj.weekday()
+        self.activity = activity
+        self.clock_in = clock_in
+        self.clock_out = clock_out
+        self.description = description
+        self.clock_in_minutes = time_to_minutes(clock_in)
+        self.clock_out_minutes = time_to_minutes(clock_out)
+        self.clock_in_12hr = minutes_to_12hour(self.clock_in_minutes)
+        self.clock_out_12hr = minutes_to_12hour(self.clock_out_minutes)
+
+    @classmethod
+    def create(cls, date, activity, clock_in, clock_out, description):
+        # date may be a YYYY-MM-DD string or a datetime; raises ValueError for malformed values.
+        date_obj = datetime.strptime(date, '%Y-%m-%d') if isinstance(date, str) else date
+        return cls(date_obj, activity.strip(), clock_in.strip(), clock_out.strip(), description.strip())
+
+    @property
+    def month(self):
+        return self.month_key[1]
+
+    @property
+    def year(self):
+        return self.month_key[0]
+
+    @property
+    def is_off(self):
+        return self.clock_in_minutes is None
+
+    def matches(self, existing):
+        # True when the server row already holds this entry; clocks are compared as minutes.
+        try:
+            return (
+                (existing.get("activity") or "").strip() == self.activity
+                and (existing.get("description") or "").strip() == self.description
+                and parse_12hour(existing.get("clockIn")) == self.clock_in_minutes
+                and parse_12hour(existing.get("clockOut")) == self.clock_out_minutes
+            )
+        except ValueError:
+            return False
+
+    def as_off(self):
+        return LogEntry(self.date_obj, OFF_VALUE, OFF_VALUE, OFF_VALUE, OFF_VALUE)
+
+    def __repr__(self):
+        return f"LogEntry({self.date}, {self.clock_in}-{self.clock_out}, {self.activity!r})"
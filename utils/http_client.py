@@ -0,0 +1,75 @@
+import threading
+import requests
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
+from utils.config import get_http_settings
+from utils.utils import logger
+from utils.constants import REFERER_URL
+
+_session = None
+_session_lock = threading.Lock()
+_timeout = None
+
+class _ManagedCookiePolicy(DefaultCookiePolicy):
+    """Keeps the session jar empty; response cookies are merged into the session store instead."""
+
+    def set_ok(self, cookie, request):
+        return False
+
+def create_http_session(settings=None):
+    try:
+        if settings is None:
+            settings = get_http_settings()
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=settings['pool_connections'],
+            pool_maxsize=settings['pool_maxsize'],
+            max_retries=0
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        # A cookie stored here would be sent next to the stored copy under the same name.
+        session.cookies.set_policy(_ManagedCookiePolicy())
+
+        session.headers.update({
+            'Connection': 'keep-alive',
+            'X-Requested-With': 'XMLHttpRequest',
+            'Referer': REFERER_URL
+        })
+
+        logger.info(
+            f"Created HTTP session (pool {settings['pool_connections']}x{settings['pool_maxsize']}, "
+            f"timeouts {settings['connect_timeout']}s connect / {settings['read_timeout']}s read)"
+        )
+        return session
+    except Exception as e:
+        logger.error(f"Error creating HTTP session: {str(e)}")
+        raise
+
+def get_http_session():
+    global _session, _timeout
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                settings = get_http_settings()
+                _timeout = (settings['connect_timeout'], settings['read_timeout'])
+                _session = create_http_session(settings)
+    return _session
+
+def get_http_timeout():
+    if _timeout is None:
+        get_http_session()
+    return _timeout
+
+def close_http_session():
+    global _session, _timeout
+    with _session_lock:
+        if _session is not None:
+            try:
+                _session.close()
+                logger.info("HTTP session closed")
+            except Exception as e:
+                logger.warning(f"Error closing HTTP session: {str(e)}")
+            _session = None
+            _timeout = None
@@ -5,27 +5,89 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.chrome.service import Service
 import undetected_chromedriver as uc
+import os
 import time
 import getpass
-import sys
 from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
 from datetime import datetime, timezone
-from utils.utils import save_data_securely, logger
+from utils.utils import save_data_securely, load_json_cache, save_json_cache, logger
+from utils.config import get_login_settings
+from utils.browser_pool import get_browser_pool
 from utils.constants import (
     LOGIN_URL, XPATH_MS_LOGIN_BTN, XPATH_EMAIL_INPUT, XPATH_NEXT_BUTTON,
     XPATH_PASSWORD_INPUT, XPATH_SIGN_IN_BUTTON, XPATH_ENRICHMENT_DASHBOARD,
     XPATH_INTERNSHIP_SECTION, XPATH_LOGBOOK_NAV, XPATH_ODD_SEMESTER_DROPDOWN,
-    XPATH_ODD_SEMESTER_ITEM
+    XPATH_ODD_SEMESTER_ITEM, LOGBOOK_HOST, LOGIN_WAIT_TIMEOUT, LOGIN_POLL_INTERVAL,
+    NETWORK_IDLE_QUIET_PERIOD, DRIVER_CACHE_FILE, LOGIN_WINDOW_SIZE, FAST_LOGIN_ARGUMENTS,
+    BLOCKED_RESOURCE_PATTERNS, MICROSOFT_LOGIN_HOST
 )
 from utils.display import print_info, print_error, print_success, print_warning
 
-def setup_driver():
+_resolved_driver = {}
+
+def get_chrome_major_version():
+    try:
+        version = OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+        if version:
+            return version.split(".")[0]
+    except Exception as e:
+        logger.warning(f"Could not detect installed Chrome version: {str(e)}")
+    return None
+
+def resolve_driver_path():
+    chrome_major = get_chrome_major_version()
+    
+    cached_path = _resolved_driver.get(chrome_major)
+    if cached_path and os.path.exists(cached_path):
+        return cached_path
+    
+    cache = load_json_cache(DRIVER_CACHE_FILE) or {}
+    cached_path = cache.get("driver_path")
+    if cached_path and os.path.exists(cached_path):
+        if chrome_major and cache.get("chrome_major") == chrome_major:
+            logger.info(f"Using cached chromedriver for Chrome {chrome_major}: {cached_path}")
+            _resolved_driver[chrome_major] = cached_path
+            return cached_path
+        if chrome_major is None:
+            logger.warning("Chrome version unknown; reusing last cached chromedriver")
+            return cached_path
+    
+    logger.info(f"Resolving chromedriver for Chrome {chrome_major or 'unknown'}")
+    driver_path = ChromeDriverManager().install()
+    if chrome_major:
+        save_json_cache(DRIVER_CACHE_FILE, {"chrome_major": chrome_major, "driver_path": driver_path})
+        _resolved_driver[chrome_major] = driver_path
+    return driver_path
+
+def build_chrome_options(fast=False):
+    options = uc.ChromeOptions()
+    if fast:
+        options.add_argument(f"--window-size={LOGIN_WINDOW_SIZE}")
+        for argument in FAST_LOGIN_ARGUMENTS:
+            options.add_argument(argument)
+    return options
+
+def block_heavy_resources(driver):
     try:
-        logger.info("Setting up Chrome driver")
-        driver_path = ChromeDriverManager().install()
-        options = uc.ChromeOptions()
-        # options.add_argument('--headless')
-        driver = uc.Chrome(driver_executable_path=driver_path, options=options)
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_RESOURCE_PATTERNS})
+        logger.info(f"Blocking {len(BLOCKED_RESOURCE_PATTERNS)} resource patterns during login")
+    except Exception as e:
+        logger.warning(f"Could not enable resource blocking: {str(e)}")
+
+def setup_driver(fast=None):
+    try:
+        if fast is None:
+            fast = get_login_settings()['headless']
+        logger.info(f"Setting up Chrome driver ({'fast headless' if fast else 'standard'} profile)")
+        driver_path = resolve_driver_path()
+        options = build_chrome_options(fast)
+        # undetected_chromedriver uses a throwaway profile directory unless one is given,
+        # and masks the HeadlessChrome user agent when headless is set.
+        driver = uc.Chrome(driver_executable_path=driver_path, options=options, headless=fast)
+        if fast:
+            block_heavy_resources(driver)
         logger.info("Chrome driver setup successful")
         return driver
     except WebDriverException as e:
@@ -33,12 +95,12 @@ def setup_driver():
         logger.error(error_msg)
         print_error(error_msg)
         print_error("Please make sure Chrome is installed and updated")
-        sys.exit(1)
+        raise WebDriverException(error_msg)
     except Exception as e:
         error_msg = f"Unexpected error setting up driver: {str(e)}"
         logger.error(error_msg)
         print_error(error_msg)
-        sys.exit(1)
+        raise WebDriverException(error_msg)
 
 def navigate_to_page(driver, url, message="Navigating to page..."):
     try:
@@ -54,12 +116,13 @@ def navigate_to_page(driver, url, message="Navigating to page..."):
 
 def wait_for_element(driver, xpath, timeout=10, clickable=False):
     try:
-        wait = WebDriverWait(driver, timeout)
+        started = time.perf_counter()
+        wait = WebDriverWait(driver, timeout, poll_frequency=LOGIN_POLL_INTERVAL)
         if clickable:
             element = wait.until(EC.element_to_be_clickable((By.XPATH, xpath)))
         else:
             element = wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
-        logger.debug(f"Element found: {xpath}")
+        logger.debug(f"Element found after {time.perf_counter() - started:.2f}s: {xpath}")
         return element
     except TimeoutException:
         error_msg = f"Element not found within {timeout} seconds: {xpath}"
@@ -70,11 +133,173 @@ def wait_for_element(driver, xpath, timeout=10, clickable=False):
         logger.error(error_msg)
         raise
 
+def wait_for_condition(driver, condition, description, timeout=LOGIN_WAIT_TIMEOUT):
+    started = time.perf_counter()
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=LOGIN_POLL_INTERVAL).until(condition)
+        logger.info(f"Waited {time.perf_counter() - started:.2f}s for {description}")
+        return result
+    except TimeoutException:
+        logger.warning(f"Timed out after {time.perf_counter() - started:.2f}s waiting for {description}")
+        raise
+
+def network_idle(quiet_period=NETWORK_IDLE_QUIET_PERIOD):
+    # Idle means the document has loaded, no jQuery requests are active and no new
+    # resources have been fetched for quiet_period seconds.
+    state = {'count': None, 'since': None}
+    
+    def condition(driver):
+        ready_state, resource_count, active = driver.execute_script(
+            "return [document.readyState, "
+            "performance.getEntriesByType('resource').length, "
+            "(window.jQuery ? window.jQuery.active : 0)];"
+        )
+        now = time.monotonic()
+        if ready_state != "complete" or active:
+            state['count'] = None
+            return False
+        if resource_count != state['count']:
+            state['count'] = resource_count
+            state['since'] = now
+            return False
+        return now - state['since'] >= quiet_period
+    
+    return condition
+
+def session_cookies_present(host):
+    def condition(driver):
+        if host not in driver.current_url:
+            return False
+        return bool(driver.get_cookies())
+    return condition
+
+def sign_in_with_microsoft(driver, username=None, password=None):
+    # Click Microsoft login button
+    logger.info("Attempting to click Microsoft login button")
+    print_info("Clicking Microsoft login button...")
+    try:
+        microsoft_login = wait_for_element(driver, XPATH_MS_LOGIN_BTN, timeout=15)
+        microsoft_login.click()
+        logger.info("Microsoft login button clicked successfully")
+    except TimeoutException:
+        error_msg = "Microsoft login button not found. Check if the login page has changed."
+        logger.error(error_msg)
+        print_error(error_msg)
+        return False
+
+    # Get credentials
+    if not username:
+        username = input("Enter your Microsoft email: ")
+    if not password:
+        password = getpass.getpass("Enter your password: ")
+
+    if not username or not password:
+        error_msg = "Username and password are required"
+        logger.error(error_msg)
+        print_error(error_msg)
+        return False
+
+    # Enter email
+    logger.info("Entering email address")
+    print_info("Entering email...")
+    try:
+        email_input = wait_for_element(driver, XPATH_EMAIL_INPUT, timeout=15)
+        email_input.send_keys(username)
+
+        next_button = driver.find_element(By.XPATH, XPATH_NEXT_BUTTON)
+        next_button.click()
+        logger.info("Email entered and next button clicked")
+    except TimeoutException:
+        error_msg = "Email input not found. The login page may have changed."
+        logger.error(error_msg)
+        print_error(error_msg)
+        return False
+    except Exception as e:
+        error_msg = f"Error entering email: {str(e)}"
+        logger.error(error_msg)
+        print_error(error_msg)
+        return False
+
+    # Enter password
+    logger.info("Entering password")
+    print_info("Entering password...")
+    try:
+        password_input = wait_for_element(driver, XPATH_PASSWORD_INPUT, timeout=15)
+        password_input.send_keys(password)
+
+        print_info("Clicking sign in...")
+        signin = wait_for_element(driver, XPATH_SIGN_IN_BUTTON, clickable=True, timeout=15)
+        driver.execute_script("arguments[0].scrollIntoView(true);", signin)
+        signin = wait_for_element(driver, XPATH_SIGN_IN_BUTTON, clickable=True, timeout=15)
+        signin.click()
+        logger.info("Password entered and sign in clicked")
+        try:
+            wait_for_condition(driver, EC.staleness_of(signin), "sign-in page to change", timeout=15)
+        except TimeoutException:
+            pass
+    except TimeoutException:
+        error_msg = "Password input or sign-in button not found. The login page may have changed."
+        logger.error(error_msg)
+        print_error(error_msg)
+        return False
+    except Exception as e:
+        error_msg = f"Error during sign in: {str(e)}"
+        logger.error(error_msg)
+        print_error(error_msg)
+        return False
+
+    # Handle "Stay signed in" prompt
+    logger.info("Handling 'Stay signed in' prompt")
+    print_info("Handling 'Stay signed in' prompt...")
+    try:
+        verify = wait_for_element(driver, XPATH_SIGN_IN_BUTTON, clickable=True)
+        verify.click()
+        logger.info("'Stay signed in' prompt handled")
+    except TimeoutException:
+        logger.info("No 'Stay signed in' prompt detected")
+        print_info("No 'Stay signed in' prompt detected.")
+    
+    return True
+
+def resume_signed_in_session(driver):
+    # A warm browser keeps its Microsoft session; if single sign-on completes without
+    # asking for an email, the credential steps can be skipped.
+    try:
+        microsoft_login = wait_for_element(driver, XPATH_MS_LOGIN_BTN, clickable=True, timeout=5)
+    except TimeoutException:
+        return "login" not in driver.current_url.lower()
+    
+    microsoft_login.click()
+    try:
+        wait_for_condition(
+            driver,
+            EC.any_of(
+                EC.presence_of_element_located((By.XPATH, XPATH_EMAIL_INPUT)),
+                left_sign_in_pages()
+            ),
+            "Microsoft single sign-on",
+            timeout=15
+        )
+    except TimeoutException:
+        return False
+    return left_sign_in_pages()(driver)
+
+def left_sign_in_pages():
+    def condition(driver):
+        current_url = driver.current_url.lower()
+        return MICROSOFT_LOGIN_HOST not in current_url and "login" not in current_url
+    return condition
+
 def login(username=None, password=None, is_odd_semester=None):
     driver = None
+    pool = get_browser_pool(setup_driver)
+    succeeded = False
     try:
         logger.info("Starting login process")
-        driver = setup_driver()
+        if pool:
+            driver, warm = pool.acquire(key=username)
+        else:
+            driver, warm = setup_driver(), False
         
         navigate_to_page(driver, LOGIN_URL, "Navigating to login page...")
         
@@ -87,87 +312,14 @@ def login(username=None, password=None, is_odd_semester=None):
             user_agent = None
             print_warning("Could not detect User-Agent, using default")
         
-        # Click Microsoft login button
-        logger.info("Attempting to click Microsoft login button")
-        print_info("Clicking Microsoft login button...")
-        try:
-            microsoft_login = wait_for_element(driver, XPATH_MS_LOGIN_BTN, timeout=15)
-            microsoft_login.click()
-            logger.info("Microsoft login button clicked successfully")
-        except TimeoutException:
-            error_msg = "Microsoft login button not found. Check if the login page has changed."
-            logger.error(error_msg)
-            print_error(error_msg)
-            return None
-        
-        # Get credentials
-        if not username:
-            username = input("Enter your Microsoft email: ")
-        if not password:
-            password = getpass.getpass("Enter your password: ")
-        
-        if not username or not password:
-            error_msg = "Username and password are required"
-            logger.error(error_msg)
-            print_error(error_msg)
-            return None
-        
-        # Enter email
-        logger.info("Entering email address")
-        print_info("Entering email...")
-        try:
-            email_input = wait_for_element(driver, XPATH_EMAIL_INPUT, timeout=15)
-            email_input.send_keys(username)
-            
-            next_button = driver.find_element(By.XPATH, XPATH_NEXT_BUTTON)
-            next_button.click()
-            logger.info("Email entered and next button clicked")
-        except TimeoutException:
-            error_msg = "Email input not found. The login page may have changed."
-            logger.error(error_msg)
-            print_error(error_msg)
-            return None
-        except Exception as e:
-            error_msg = f"Error entering email: {str(e)}"
-            logger.error(error_msg)
-            print_error(error_msg)
-            return None
-        
-        # Enter password
-        logger.info("Entering password")
-        print_info("Entering password...")
-        try:
-            password_input = wait_for_element(driver, XPATH_PASSWORD_INPUT, timeout=15)
-            password_input.send_keys(password)
-            time.sleep(2)
-            
-            print_info("Clicking sign in...")
-            signin = wait_for_element(driver, XPATH_SIGN_IN_BUTTON, clickable=True, timeout=15)
-            driver.execute_script("arguments[0].scrollIntoView(true);", signin)
-            time.sleep(1)
-            signin.click()
-            logger.info("Password entered and sign in clicked")
-        except TimeoutException:
-            error_msg = "Password input or sign-in button not found. The login page may have changed."
-            logger.error(error_msg)
-            print_error(error_msg)
-            return None
-        except Exception as e:
-            error_msg = f"Error during sign in: {str(e)}"
-            logger.error(error_msg)
-            print_error(error_msg)
-            return None
-        
-        # Handle "Stay signed in" prompt
-        logger.info("Handling 'Stay signed in' prompt")
-        print_info("Handling 'Stay signed in' prompt...")
-        try:
-            verify = wait_for_element(driver, XPATH_SIGN_IN_BUTTON, clickable=True)
-            verify.click()
-            logger.info("'Stay signed in' prompt handled")
-        except TimeoutException:
-            logger.info("No 'Stay signed in' prompt detected")
-            print_info("No 'Stay signed in' prompt detected.")
+        if warm and resume_signed_in_session(driver):
+            logger.info("Warm browser is still signed in; skipping Microsoft sign-in")
+            print_info("Reusing signed-in browser session...")
+        else:
+            if warm:
+                navigate_to_page(driver, LOGIN_URL, "Restarting sign-in...")
+            if not sign_in_with_microsoft(driver, username, password):
+                return None
         
         # Optional: select odd semester if requested by caller (before navigating to Enrichment Dashboard)
         if is_odd_semester is True:
@@ -176,12 +328,15 @@ def login(username=None, password=None, is_odd_semester=None):
             try:
                 dropdown = wait_for_element(driver, XPATH_ODD_SEMESTER_DROPDOWN, clickable=True, timeout=15)
                 driver.execute_script("arguments[0].scrollIntoView(true);", dropdown)
-                time.sleep(1)
+                dropdown = wait_for_element(driver, XPATH_ODD_SEMESTER_DROPDOWN, clickable=True, timeout=15)
                 dropdown.click()
                 item = wait_for_element(driver, XPATH_ODD_SEMESTER_ITEM, clickable=True, timeout=15)
                 item.click()
-                logger.info("Odd semester selected. Waiting 7 seconds for page to update")
-                time.sleep(7)
+                logger.info("Odd semester selected. Waiting for page to update")
+                try:
+                    wait_for_condition(driver, network_idle(), "semester change to load")
+                except TimeoutException:
+                    logger.warning("Page did not settle after semester change; continuing")
             except TimeoutException:
                 logger.warning("Odd semester dropdown or item not found")
                 print_warning("Odd semester selection controls not found.")
@@ -215,16 +370,18 @@ def login(username=None, password=None, is_odd_semester=None):
         logger.info("Navigating to Logbook")
         print_info("Navigating to Logbook...")
         try:
-            time.sleep(2)
-            logbook = wait_for_element(driver, XPATH_LOGBOOK_NAV)
+            logbook = wait_for_element(driver, XPATH_LOGBOOK_NAV, clickable=True)
             logbook.click()
-            time.sleep(2)
             logger.info("Logbook navigation successful")
         except TimeoutException:
             logger.warning("Logbook navigation element not found")
             print_warning("Logbook navigation element not found.")
         
-        time.sleep(5)  # Wait for page to fully load
+        try:
+            wait_for_condition(driver, session_cookies_present(LOGBOOK_HOST), "logbook session cookies")
+            wait_for_condition(driver, network_idle(), "logbook page to finish loading")
+        except TimeoutException:
+            logger.warning("Logbook page did not settle in time; continuing with current state")
         
         # Verify successful login
         current_url = driver.current_url
@@ -251,10 +408,12 @@ def login(username=None, password=None, is_odd_semester=None):
         data_to_save = {
             "cookies": cookies,
             "user_agent": user_agent,
+            "is_odd_semester": bool(is_odd_semester),
             "generated_at": datetime.now(timezone.utc).isoformat()
         }
         if save_data_securely(data_to_save):
             logger.info("Login data saved securely")
+            succeeded = True
             return cookies
         else:
             logger.error("Failed to save login data")
@@ -271,10 +430,11 @@ def login(username=None, password=None, is_odd_semester=None):
         print_error(error_msg)
         return None
     finally:
-        if driver:
+        if driver and pool:
+            pool.release(driver, key=username, healthy=succeeded)
+        elif driver:
             try:
                 logger.info("Closing browser")
-                time.sleep(3)
                 driver.quit()
                 logger.info("Browser closed successfully")
             except Exception as e:
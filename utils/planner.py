@@ -0,0 +1,242 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from utils.api import submit_entry, is_month_available_for_submission
+from utils.reauth import ReauthenticationError
+from utils.config import get_submission_workers
+from utils.utils import logger
+from utils.constants import (
+    WEEKDAY_SATURDAY, WEEKDAY_SUNDAY, PLAN_CREATE, PLAN_OVERWRITE,
+    PLAN_SKIP, PLAN_BLOCKED, PLAN_UNCHANGED, PLAN_WRITE_ACTIONS
+)
+from utils.display import print_info, print_error, print_success, print_warning
+
+def _make_plan_item(entry, action, reason, existing=None):
+    return {
+        'entry': entry,
+        'date': entry.date,
+        'action': action,
+        'reason': reason,
+        'existing': existing
+    }
+
+def _confirm_overwrite(date, existing_entry):
+    print_info(f"Entry already exists for {date}:")
+    print_info(f"  Activity: {existing_entry['activity']}")
+    print_info(f"  Clock In: {existing_entry['clockIn']}")
+    print_info(f"  Clock Out: {existing_entry['clockOut']}")
+    print_info(f"  Description: {existing_entry['description']}")
+    confirm = input(f"Do you want to overwrite this entry for {date}? (y/n): ").strip().lower()
+    return confirm == 'y'
+
+def plan_entry(entry, snapshot, force_overwrite=False, completion_status=None):
+    # completion_status may be a projection that already counts earlier planned writes;
+    # prepare_submission checks the live snapshot again before each write.
+    month = entry.month
+    
+    if entry.weekday == WEEKDAY_SUNDAY:
+        return _make_plan_item(entry, PLAN_SKIP, "Sunday entries are not submitted")
+    
+    if month not in snapshot.months_data:
+        return _make_plan_item(entry, PLAN_BLOCKED, "Month is not available in the logbook system")
+    
+    if completion_status is None:
+        available, message = snapshot.is_month_available(month, entry.year)
+    else:
+        available, message = is_month_available_for_submission(month, entry.year, completion_status)
+    if not available:
+        return _make_plan_item(entry, PLAN_BLOCKED, message)
+    
+    if snapshot.get_entries(month) is None:
+        return _make_plan_item(entry, PLAN_BLOCKED, "Existing entries for this month could not be fetched")
+    
+    reason_suffix = ""
+    if entry.weekday == WEEKDAY_SATURDAY and os.getenv("SATURDAY_SUBMISSION", "false").lower() != "true":
+        entry = entry.as_off()
+        reason_suffix = " (Saturday submitted as OFF)"
+    
+    existing_entry = snapshot.get_existing_entry(entry)
+    if not existing_entry:
+        return _make_plan_item(entry, PLAN_CREATE, "New entry" + reason_suffix)
+    
+    if entry.matches(existing_entry):
+        return _make_plan_item(entry, PLAN_UNCHANGED, "Already up to date" + reason_suffix, existing_entry)
+    
+    if force_overwrite:
+        return _make_plan_item(entry, PLAN_OVERWRITE, "Existing entry, force overwrite" + reason_suffix, existing_entry)
+    
+    if _confirm_overwrite(entry.date, existing_entry):
+        logger.info(f"User confirmed overwriting entry for {entry.date}")
+        return _make_plan_item(entry, PLAN_OVERWRITE, "Existing entry, overwrite confirmed" + reason_suffix, existing_entry)
+    
+    logger.info(f"User chose not to overwrite entry for {entry.date}")
+    return _make_plan_item(entry, PLAN_SKIP, "Existing entry kept", existing_entry)
+
+def _project_create(completion_status, entry):
+    # Mirrors LogbookSnapshot.record_submission: a new entry fills one empty day of its month.
+    status = completion_status.get(entry.month)
+    if status is not None:
+        status['empty_entries'] = max(status['empty_entries'] - 1, 0)
+
+def build_submission_plan(entries_by_month, snapshot, force_overwrite=False):
+    # Months are planned in order against a projected status, so a month that the plan
+    # completes does not block the next one.
+    projected_status = {month: dict(status) for month, status in snapshot.completion_status.items()}
+    plan = []
+    for month_key in sorted(entries_by_month.keys()):
+        for entry in entries_by_month[month_key]:
+            item = plan_entry(entry, snapshot, force_overwrite, projected_status)
+            if item['action'] == PLAN_CREATE:
+                _project_create(projected_status, item['entry'])
+            logger.debug(f"Planned {item['date']}: {item['action']} ({item['reason']})")
+            plan.append(item)
+    
+    counts = summarize_plan(plan)
+    logger.info(f"Submission plan built: {counts}")
+    return plan
+
+def _empty_counts():
+    return {PLAN_CREATE: 0, PLAN_OVERWRITE: 0, PLAN_UNCHANGED: 0, PLAN_SKIP: 0, PLAN_BLOCKED: 0}
+
+def summarize_plan(plan):
+    counts = _empty_counts()
+    for item in plan:
+        counts[item['action']] = counts.get(item['action'], 0) + 1
+    return counts
+
+def get_plan_writes(plan):
+    return [item for item in plan if item['action'] in PLAN_WRITE_ACTIONS]
+
+def submit_planned_entry(item, snapshot):
+    date = item['date']
+    try:
+        logger.info(f"Submitting logbook for date: {date} ({item['action']})")
+        print_info(f"Submitting logbook for date: {date}")
+        response = submit_entry(item['entry'], force=item['action'] == PLAN_OVERWRITE, snapshot=snapshot)
+        
+        if "error" in response:
+            logger.error(f"Logbook submission failed for {date}: {response['error']}")
+            print_error(f"Logbook submission failed: {response['error']}")
+            return False
+        
+        logger.info(f"Logbook entry for {date} submitted successfully")
+        print_success(f"Logbook entry for {date} submitted successfully")
+        return True
+    except ReauthenticationError:
+        raise
+    except Exception as e:
+        logger.error(f"Cannot submit entry for {date}: {str(e)}")
+        print_error(f"Cannot submit entry for {date}: {str(e)}")
+        return False
+
+def group_writes_by_month(writes):
+    groups = {}
+    for item in writes:
+        groups.setdefault(item['entry'].month_key, []).append(item)
+    return [groups[key] for key in sorted(groups.keys())]
+
+def _submit_month_sequential(items, snapshot):
+    success_count = 0
+    for item in items:
+        if submit_planned_entry(item, snapshot):
+            success_count += 1
+    return success_count
+
+def _submit_month_concurrent(items, snapshot, workers):
+    success_count = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="nullog-submit") as executor:
+        futures = [executor.submit(submit_planned_entry, item, snapshot) for item in items]
+        for future in futures:
+            try:
+                if future.result():
+                    success_count += 1
+            except ReauthenticationError:
+                # Without a session every remaining entry would fail the same way.
+                for pending in futures:
+                    pending.cancel()
+                raise
+            except Exception as e:
+                logger.error(f"Submission worker failed: {str(e)}")
+    return success_count
+
+def execute_submission_plan(plan, snapshot, workers=None):
+    if workers is None:
+        workers = get_submission_workers()
+    
+    writes = get_plan_writes(plan)
+    success_count = 0
+    
+    logger.info(f"Executing submission plan: {len(writes)} writes with {workers} worker(s)")
+    # Months run one after another so the previous-month rule sees completed months;
+    # entries within a month are independent and may run in parallel.
+    try:
+        for items in group_writes_by_month(writes):
+            if workers > 1 and len(items) > 1:
+                success_count += _submit_month_concurrent(items, snapshot, min(workers, len(items)))
+            else:
+                success_count += _submit_month_sequential(items, snapshot)
+    except ReauthenticationError:
+        logger.error(f"Submission aborted after {success_count}/{len(writes)} writes: session could not be renewed")
+        print_error(f"Session could not be renewed. Stopped after {success_count} of {len(writes)} entries.")
+        raise
+    
+    logger.info(f"Submission plan executed: {success_count}/{len(writes)} succeeded")
+    return success_count
+
+def _needs_confirmation(entry, snapshot, force_overwrite):
+    if force_overwrite:
+        return False
+    existing_entry = snapshot.get_existing_entry(entry)
+    return existing_entry is not None and not entry.matches(existing_entry)
+
+def execute_streaming_submission(entries, snapshot, force_overwrite=False, workers=None):
+    # Plans and submits entries as they arrive from a generator. Entries of one month may run in
+    # parallel; a new month first waits for the previous month's writes so its availability check
+    # sees them. Rows are expected in date order, otherwise later months may be blocked.
+    if workers is None:
+        workers = get_submission_workers()
+    
+    counts = _empty_counts()
+    in_flight = deque()
+    success_count = 0
+    current_month = None
+    
+    def drain(limit):
+        nonlocal success_count
+        while len(in_flight) > limit:
+            if in_flight.popleft().result():
+                success_count += 1
+    
+    logger.info(f"Streaming submission started with {workers} worker(s)")
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="nullog-submit") as executor:
+        try:
+            for entry in entries:
+                if entry.month_key != current_month:
+                    drain(0)
+                    current_month = entry.month_key
+                elif _needs_confirmation(entry, snapshot, force_overwrite):
+                    # Let workers finish so their output does not interleave with the prompt.
+                    drain(0)
+                
+                item = plan_entry(entry, snapshot, force_overwrite)
+                counts[item['action']] += 1
+                if item['action'] not in PLAN_WRITE_ACTIONS:
+                    logger.info(f"Not submitting {item['date']}: {item['action']} ({item['reason']})")
+                    if item['action'] == PLAN_BLOCKED:
+                        print_warning(f"Skipping {item['date']}: {item['reason']}")
+                    continue
+                
+                in_flight.append(executor.submit(submit_planned_entry, item, snapshot))
+                # Bound the queue so memory stays flat however long the input is.
+                drain(workers * 2)
+            drain(0)
+        except ReauthenticationError:
+            for pending in in_flight:
+                pending.cancel()
+            writes = counts[PLAN_CREATE] + counts[PLAN_OVERWRITE]
+            logger.error(f"Streaming submission aborted after {success_count}/{writes} writes: session could not be renewed")
+            print_error(f"Session could not be renewed. Stopped after {success_count} of {writes} entries.")
+            raise
+    
+    logger.info(f"Streaming submission finished: {counts}, {success_count} succeeded")
+    return success_count, counts
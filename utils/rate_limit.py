@@ -0,0 +1,117 @@
+import threading
+import time
+from utils.utils import logger
+from utils.constants import (
+    ADAPTIVE_LATENCY_SPIKE_FACTOR, ADAPTIVE_LATENCY_SPIKE_MIN_FRACTION, ADAPTIVE_LATENCY_SMOOTHING,
+    ADAPTIVE_DECREASE_COOLDOWN
+)
+
+class TokenBucket:
+    """Thread-safe token bucket; rate is in requests per second, a rate of 0 disables limiting."""
+
+    def __init__(self, rate, burst, name="bucket"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._rate = max(float(rate), 0.0)
+        self._capacity = max(float(burst), 1.0)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+
+    @property
+    def rate(self):
+        return self._rate
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._updated = now
+        if elapsed > 0 and self._rate > 0:
+            self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+
+    def set_rate(self, rate):
+        with self._lock:
+            self._refill(time.monotonic())
+            self._rate = max(float(rate), 0.0)
+
+    def reserve(self):
+        # Takes a token now and returns how long the caller must wait before using it.
+        # Tokens may go negative, which queues concurrent callers fairly behind each other.
+        with self._lock:
+            if self._rate <= 0:
+                return 0.0
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            logger.debug(f"Rate limiter '{self.name}' waiting {wait:.2f}s")
+            time.sleep(wait)
+        return wait
+
+    def record_response(self, latency=None, status_code=None, failed=False):
+        pass
+
+class AdaptiveTokenBucket(TokenBucket):
+    """Token bucket whose rate follows AIMD: additive increase while healthy,
+    multiplicative decrease on throttling, server errors, timeouts or latency spikes."""
+
+    def __init__(self, rate, burst, min_rate, max_rate, increase_step, decrease_factor,
+                 latency_threshold, name="bucket"):
+        super().__init__(rate, burst, name=name)
+        self.min_rate = max(float(min_rate), 0.01)
+        self.max_rate = max(float(max_rate), self.min_rate)
+        self.increase_step = float(increase_step)
+        self.decrease_factor = min(max(float(decrease_factor), 0.1), 0.95)
+        self.latency_threshold = float(latency_threshold)
+        self._stats_lock = threading.Lock()
+        self._latency_avg = None
+        self._last_decrease = 0.0
+
+    def _is_congested(self, latency, status_code, failed):
+        if failed:
+            return True
+        if status_code is not None and (status_code == 429 or status_code >= 500):
+            return True
+        if latency is None:
+            return False
+        if latency >= self.latency_threshold:
+            return True
+        if self._latency_avg is None:
+            return False
+        # Small absolute blips on a fast server are noise, not congestion.
+        return (latency > self._latency_avg * ADAPTIVE_LATENCY_SPIKE_FACTOR
+                and latency - self._latency_avg >= self.latency_threshold * ADAPTIVE_LATENCY_SPIKE_MIN_FRACTION)
+
+    def record_response(self, latency=None, status_code=None, failed=False):
+        if self.rate <= 0:
+            return
+        
+        with self._stats_lock:
+            congested = self._is_congested(latency, status_code, failed)
+            # Only successful responses form the baseline; fast 403/429/5xx replies would drag it down.
+            if latency is not None and not failed and status_code is not None and 200 <= status_code < 300:
+                if self._latency_avg is None:
+                    self._latency_avg = latency
+                else:
+                    self._latency_avg += ADAPTIVE_LATENCY_SMOOTHING * (latency - self._latency_avg)
+            
+            now = time.monotonic()
+            if congested:
+                # Concurrent failures from one slowdown should only count once.
+                if now - self._last_decrease < ADAPTIVE_DECREASE_COOLDOWN:
+                    return
+                self._last_decrease = now
+                new_rate = max(self.min_rate, self.rate * self.decrease_factor)
+                latency_str = "n/a" if latency is None else f"{latency:.2f}s"
+                logger.warning(
+                    f"Throttling '{self.name}' to {new_rate:.2f} req/s "
+                    f"(status={status_code}, latency={latency_str}, failed={failed})"
+                )
+            else:
+                new_rate = min(self.max_rate, self.rate + self.increase_step)
+            
+            if new_rate != self.rate:
+                self.set_rate(new_rate)
@@ -0,0 +1,66 @@
+import threading
+from utils.utils import logger
+
+class ReauthenticationError(Exception):
+    """Raised when the session could not be renewed by logging in again."""
+
+class ReauthCoordinator:
+    """Runs one login at a time; callers that hit the same expired session share its result."""
+
+    def __init__(self, login_func):
+        self._login = login_func
+        self._cond = threading.Condition()
+        self._generation = 0
+        self._in_progress = False
+        self._error = None
+
+    @property
+    def generation(self):
+        # Bumped after every successful login; callers record it before using the cookies.
+        with self._cond:
+            return self._generation
+
+    def refresh(self, seen_generation=None):
+        with self._cond:
+            if seen_generation is not None and seen_generation != self._generation:
+                logger.debug("Session was already renewed by another caller")
+                return self._generation
+
+            if self._in_progress:
+                logger.info("Waiting for the login already in progress")
+                started_from = self._generation
+                while self._in_progress:
+                    self._cond.wait()
+                if self._generation == started_from:
+                    raise self._error or ReauthenticationError("Login failed")
+                return self._generation
+
+            self._in_progress = True
+            self._error = None
+
+        error = None
+        try:
+            if not self._login():
+                error = ReauthenticationError("Login did not produce a session")
+        except ReauthenticationError as e:
+            error = e
+        except Exception as e:
+            error = ReauthenticationError(f"Login failed: {str(e)}")
+        except BaseException:
+            # SystemExit or KeyboardInterrupt still propagate here, but waiters must be released.
+            error = ReauthenticationError("Login was interrupted")
+            raise
+        finally:
+            with self._cond:
+                self._in_progress = False
+                if error is None:
+                    self._generation += 1
+                self._error = error
+                self._cond.notify_all()
+                generation = self._generation
+
+        if error is not None:
+            logger.error(str(error))
+            raise error
+        logger.info(f"Session renewed (generation {generation})")
+        return generation
@@ -0,0 +1,47 @@
+import random
+import threading
+from utils.utils import logger
+from utils.constants import RETRYABLE_STATUS_CODES, UNPROCESSED_STATUS_CODES
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded per request and by a shared per-run budget."""
+
+    def __init__(self, max_attempts, base_delay, max_delay, budget, name="endpoint"):
+        self.name = name
+        self.max_attempts = max(int(max_attempts), 1)
+        self.base_delay = max(float(base_delay), 0.0)
+        self.max_delay = max(float(max_delay), self.base_delay)
+        self._budget = max(int(budget), 0)
+        self._lock = threading.Lock()
+
+    @property
+    def remaining_budget(self):
+        return self._budget
+
+    def is_retryable_status(self, status_code, idempotent):
+        # Non-idempotent requests are only retried when the server did not process them.
+        if idempotent:
+            return status_code in RETRYABLE_STATUS_CODES
+        return status_code in UNPROCESSED_STATUS_CODES
+
+    def allow_retry(self, attempt):
+        if attempt >= self.max_attempts:
+            return False
+        with self._lock:
+            if self._budget <= 0:
+                logger.warning(f"Retry budget for '{self.name}' exhausted")
+                return False
+            self._budget -= 1
+            return True
+
+    def get_delay(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+def parse_retry_after(value):
+    try:
+        return max(float(value), 0.0) if value else None
+    except (TypeError, ValueError):
+        return None
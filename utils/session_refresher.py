@@ -0,0 +1,107 @@
+import threading
+from datetime import datetime, timezone
+from utils.api import probe_session, refresh_session, get_session_generation
+from utils.cookies import get_session_deadline, cookies_expire_within, record_session_expiry
+from utils.config import get_session_refresh_settings, credentials_available
+from utils.reauth import ReauthenticationError
+from utils.utils import session_store, logger
+
+class SessionRefresher:
+    """Keeps the stored session alive in the background and re-authenticates before it is expected to expire."""
+
+    def __init__(self, interval, margin):
+        self.interval = max(float(interval), 1.0)
+        self.margin = max(float(margin), 0.0)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="nullog-session-refresher", daemon=True)
+        self._thread.start()
+        logger.info(f"Session refresher started: every {self.interval:.0f}s, {self.margin:.0f}s refresh margin")
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+            logger.info("Session refresher stopped")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.tick()
+            except Exception as e:
+                logger.warning(f"Background session refresh failed: {str(e)}")
+
+    def _seconds_left(self):
+        data = session_store.get_data()
+        if not isinstance(data, dict):
+            return None
+        deadline = get_session_deadline(data)
+        if deadline is None:
+            return None
+        return (deadline - datetime.now(timezone.utc)).total_seconds()
+
+    def _refresh(self, reason, generation):
+        logger.info(f"Refreshing session in the background: {reason}")
+        try:
+            refresh_session(generation)
+        except ReauthenticationError as e:
+            logger.warning(f"Background session refresh failed; requests will log in again when needed: {str(e)}")
+            return False
+        logger.info("Background session refresh succeeded")
+        return True
+
+    def tick(self):
+        generation = get_session_generation()
+        seconds_left = self._seconds_left()
+        # Look one interval ahead, since the next check may come too late.
+        horizon = self.margin + self.interval
+        near_deadline = seconds_left is None or seconds_left <= horizon
+
+        data = session_store.get_data()
+        if isinstance(data, dict) and cookies_expire_within(data, horizon):
+            return self._refresh("session cookies are about to expire", generation)
+
+        accepted_at = session_store.accepted_at
+        recently_used = accepted_at and (datetime.now(timezone.utc) - accepted_at).total_seconds() < self.interval
+        if recently_used and not near_deadline:
+            logger.debug("Session was used recently; skipping keep-alive")
+            return True
+
+        # Past the estimate the session may still be alive; an accepted probe extends its window.
+        if probe_session():
+            logger.debug("Keep-alive request accepted")
+            return True
+
+        record_session_expiry()
+        return self._refresh("keep-alive request was rejected", generation)
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+def start_session_refresher():
+    global _refresher
+    settings = get_session_refresh_settings()
+    if settings['interval'] <= 0:
+        return None
+    if not credentials_available():
+        # A background login would prompt on stdin while the main thread is reading it too.
+        logger.warning("Session refresher not started: credentials are not set in the environment or from this run's login")
+        return None
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = SessionRefresher(settings['interval'], settings['margin'])
+        _refresher.start()
+        return _refresher
+
+def stop_session_refresher():
+    global _refresher
+    with _refresher_lock:
+        if _refresher is not None:
+            _refresher.stop()
+            _refresher = None
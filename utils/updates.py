@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+import requests
+from utils.utils import load_json_cache, save_json_cache, logger
+from utils.constants import (
+    LATEST_VERSION_URL, UPDATE_CACHE_FILE, UPDATE_CHECK_TTL, UPDATE_RETRY_AFTER_FAILURE,
+    UPDATE_CHECK_TIMEOUT
+)
+from utils.display import print_info, print_success, print_warning
+
+def _parse_version(version_str):
+    try:
+        parts = version_str.strip().split(".")
+        return tuple(int(p) for p in parts)
+    except Exception:
+        return (0, 0, 0)
+
+def load_local_version():
+    try:
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        version_path = os.path.join(base_dir, "VERSION")
+        if os.path.exists(version_path):
+            with open(version_path, "r", encoding="utf-8") as f:
+                file_version = f.read().strip()
+                parsed = _parse_version(file_version)
+                if parsed != (0, 0, 0):
+                    return file_version
+        return "0.0.0"
+    except Exception:
+        return "0.0.0"
+
+def fetch_latest_version():
+    # Cached for UPDATE_CHECK_TTL; refreshed with a conditional request so an unchanged VERSION costs a 304.
+    cache = load_json_cache(UPDATE_CACHE_FILE) or {}
+    now = time.time()
+    cached_version = cache.get("latest_version")
+
+    if cached_version and now - cache.get("checked_at", 0) < UPDATE_CHECK_TTL:
+        logger.debug("Using cached update check result")
+        return cached_version
+    if now - cache.get("failed_at", 0) < UPDATE_RETRY_AFTER_FAILURE:
+        logger.debug("Skipping update check after a recent failure")
+        return cached_version
+
+    headers = {}
+    if cached_version and cache.get("etag"):
+        headers["If-None-Match"] = cache["etag"]
+    if cached_version and cache.get("last_modified"):
+        headers["If-Modified-Since"] = cache["last_modified"]
+
+    try:
+        response = requests.get(LATEST_VERSION_URL, headers=headers, timeout=UPDATE_CHECK_TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Update check failed for {LATEST_VERSION_URL}: {str(e)}")
+        save_json_cache(UPDATE_CACHE_FILE, dict(cache, failed_at=now))
+        return cached_version
+
+    if response.status_code == 304 and cached_version:
+        logger.debug("Remote VERSION unchanged")
+        save_json_cache(UPDATE_CACHE_FILE, dict(cache, checked_at=now, failed_at=0))
+        return cached_version
+    if response.status_code != 200:
+        logger.warning(f"Update check failed at {LATEST_VERSION_URL} with status code: {response.status_code}")
+        save_json_cache(UPDATE_CACHE_FILE, dict(cache, failed_at=now))
+        return cached_version
+
+    latest_version = response.text.strip()
+    save_json_cache(UPDATE_CACHE_FILE, {
+        "latest_version": latest_version,
+        "checked_at": now,
+        "failed_at": 0,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    })
+    return latest_version
+
+class UpdateCheck:
+    """Looks up the latest release in the background; the result is reported only if it is already known."""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._thread = None
+        self.latest_version = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="nullog-update-check", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            logger.info("Checking for software updates")
+            self.latest_version = fetch_latest_version()
+        except Exception as e:
+            logger.error(f"Unexpected error during update check: {str(e)}")
+        finally:
+            self._done.set()
+
+    def report(self):
+        if not self._done.is_set():
+            logger.info("Update check still running; continuing without it")
+            return False
+
+        latest_version = self.latest_version
+        if not latest_version:
+            logger.warning("Could not check for updates")
+            print_info("Could not check for updates (network or server error)")
+            return False
+
+        local_version = load_local_version()
+        latest_tuple = _parse_version(latest_version)
+        current_tuple = _parse_version(local_version)
+        if latest_tuple > current_tuple:
+            logger.info(f"New version available: {latest_version}")
+            print_warning(f"A new version ({latest_version}) is available. You are using {local_version}.")
+            print_warning("Please pull the latest version from GitHub.")
+        elif latest_tuple == current_tuple:
+            logger.info("Using latest version")
+            print_success("You are using the latest version.")
+        else:
+            logger.info("Local version is newer than remote VERSION")
+            print_success(f"You are ahead of the remote release (local {local_version} > remote {latest_version}).")
+        return True
+
+def start_update_check():
+    return UpdateCheck().start()
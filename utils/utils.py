@@ -2,11 +2,12 @@ import os
 import json
 import base64
 import logging
-from datetime import datetime
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from utils.constants import COOKIES_DIR, COOKIES_FILE, DEFAULT_USER_AGENT
+import threading
+import time
+import atexit
+from datetime import datetime, timezone
+from requests.cookies import RequestsCookieJar, create_cookie
+from utils.constants import COOKIES_DIR, COOKIES_FILE, CACHE_DIR, DEFAULT_USER_AGENT, COOKIE_FLUSH_INTERVAL
 
 # Configure logging
 def setup_logging(log_level=logging.INFO):
@@ -40,11 +41,43 @@ def get_key_file_path():
     os.makedirs(cookies_dir, exist_ok=True)
     return os.path.join(cookies_dir, "key.bin")
 
+def get_cache_path(filename):
+    cache_dir = os.path.join(os.path.dirname(__file__), CACHE_DIR)
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, filename)
+
+def load_json_cache(filename):
+    try:
+        path = get_cache_path(filename)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"Could not read cache file {filename}: {str(e)}")
+        return None
+
+def save_json_cache(filename, data):
+    try:
+        path = get_cache_path(filename)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        logger.warning(f"Could not write cache file {filename}: {str(e)}")
+        return False
+
 def derive_key_from_password(password, salt=None):
     try:
         if salt is None:
             salt = os.urandom(16)
         
+        # cryptography is imported on first use to keep it off the startup path
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+        
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,
@@ -94,17 +127,28 @@ def get_or_create_key():
     
     return key, salt
 
+def write_encrypted_file(data):
+    # Encrypts data into a temporary file next to the store; the caller swaps it in with os.replace.
+    cookies_path = get_cookies_path()
+    key, salt = get_or_create_key()
+    
+    from cryptography.fernet import Fernet
+    fernet = Fernet(key)
+    encrypted_data = fernet.encrypt(json.dumps(data).encode())
+    
+    tmp_path = f"{cookies_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(encrypted_data)
+    return tmp_path, cookies_path
+
 def save_data_securely(data):
     try:
-        cookies_path = get_cookies_path()
-        key, salt = get_or_create_key()
-        
-        fernet = Fernet(key)
-        encrypted_data = fernet.encrypt(json.dumps(data).encode())
-        
-        with open(cookies_path, "wb") as f:
-            f.write(encrypted_data)
+        tmp_path, cookies_path = write_encrypted_file(data)
         
+        # Swap the file and the cached copy together so readers never see a half-written session
+        with session_store.lock:
+            os.replace(tmp_path, cookies_path)
+            session_store.update(data)
         logger.info(f"Data securely saved to {cookies_path}")
         print(f"Data securely saved to {cookies_path}")
         return True
@@ -121,6 +165,7 @@ def load_data_securely():
             return None
         
         key, salt = get_or_create_key()
+        from cryptography.fernet import Fernet
         fernet = Fernet(key)
         
         with open(cookies_path, "rb") as f:
@@ -135,6 +180,159 @@ def load_data_securely():
         print(f"Error loading data securely: {str(e)}")
         return None
 
+class SessionStore:
+    """Process-wide cache of the decrypted session data, reloaded only when the file changes."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._data = None
+        self._signature = None
+        self._refreshed_at = None
+        self._accepted_at = None
+        self._cookie_jar = None
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(get_cookies_path())
+            return (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return None
+
+    def get_data(self):
+        with self._lock:
+            signature = self._file_signature()
+            if signature is None:
+                self._data = None
+                self._signature = None
+                return None
+            
+            if self._data is None or signature != self._signature:
+                logger.debug("Session data changed on disk; decrypting")
+                self._refreshed_at = None
+                self._accepted_at = None
+                self._cookie_jar = None
+                self._dirty = False
+                self._data = load_data_securely()
+                self._signature = signature if self._data is not None else None
+            
+            return self._data
+
+    def update(self, data):
+        with self._lock:
+            self._refreshed_at = None
+            self._accepted_at = None
+            self._cookie_jar = None
+            self._dirty = False
+            self._data = data
+            self._signature = self._file_signature()
+            logger.debug("Session store updated with freshly saved data")
+
+    def invalidate(self):
+        with self._lock:
+            self._data = None
+            self._signature = None
+            self._refreshed_at = None
+            self._accepted_at = None
+            self._cookie_jar = None
+            self._dirty = False
+            logger.debug("Session store invalidated")
+
+    def mark_refreshed(self, when=None):
+        # Records that the server accepted the stored session, which restarts its freshness window.
+        with self._lock:
+            self._refreshed_at = when or datetime.now(timezone.utc)
+
+    def mark_accepted(self, when=None):
+        # Records that an authenticated request succeeded; used to judge how precise a later 403 is.
+        with self._lock:
+            self._accepted_at = when or datetime.now(timezone.utc)
+
+    def get_cookie_jar(self):
+        # Domain-less entries, so every stored cookie is sent as before. Published jars are never
+        # mutated; a change builds a new one, which keeps requests in flight safe.
+        with self._lock:
+            data = self.get_data()
+            if not isinstance(data, dict) or not isinstance(data.get("cookies"), list):
+                return None
+            if self._cookie_jar is None:
+                jar = RequestsCookieJar()
+                for cookie in data["cookies"]:
+                    jar.set_cookie(create_cookie(cookie["name"], cookie["value"]))
+                self._cookie_jar = jar
+            return self._cookie_jar
+
+    def merge_cookies(self, updates):
+        # Absorbs Set-Cookie updates from API responses. Changes reach disk in batches via flush().
+        with self._lock:
+            if not isinstance(self._data, dict) or not isinstance(self._data.get("cookies"), list):
+                return 0
+            cookies = {cookie.get("name"): dict(cookie) for cookie in self._data["cookies"]}
+            changed = 0
+            now = time.time()
+            for name, value, expiry in updates:
+                if expiry is not None and expiry <= now:
+                    # An expiry in the past is how the server deletes a cookie.
+                    if cookies.pop(name, None) is not None:
+                        changed += 1
+                    continue
+                cookie = cookies.setdefault(name, {"name": name})
+                cookie["value"] = value
+                if expiry is not None:
+                    cookie["expiry"] = int(expiry)
+                else:
+                    cookie.pop("expiry", None)
+                changed += 1
+            if changed:
+                self._data = dict(self._data, cookies=list(cookies.values()))
+                self._cookie_jar = None
+                self._dirty = True
+            return changed
+
+    def flush(self, force=False):
+        with self._lock:
+            if not self._dirty or self._data is None:
+                return False
+            if not force and time.monotonic() - self._last_flush < COOKIE_FLUSH_INTERVAL:
+                return False
+            data = self._data
+            self._dirty = False
+            self._last_flush = time.monotonic()
+        
+        try:
+            tmp_path, cookies_path = write_encrypted_file(data)
+            with self._lock:
+                if self._data is not data:
+                    # A login or a newer merge replaced the data while this copy was being encrypted.
+                    os.remove(tmp_path)
+                    return False
+                os.replace(tmp_path, cookies_path)
+                self._signature = self._file_signature()
+            logger.debug("Flushed updated session cookies to secure storage")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not save updated session cookies: {str(e)}")
+            with self._lock:
+                if self._data is data:
+                    self._dirty = True
+            return False
+
+    @property
+    def lock(self):
+        return self._lock
+
+    @property
+    def refreshed_at(self):
+        return self._refreshed_at
+
+    @property
+    def accepted_at(self):
+        return self._accepted_at
+
+session_store = SessionStore()
+atexit.register(session_store.flush, True)
+
 # Legacy support - will be removed in future versions
 def save_data_to_pickle(data):
     """Legacy function - now uses secure storage"""
@@ -0,0 +1,126 @@
+from collections import namedtuple
+from datetime import datetime
+from utils.entries import LogEntry, OFF_VALUE, TIME_MINUTES
+from utils.constants import WEEKDAY_SUNDAY
+
+REQUIRED_FIELDS = ('date', 'activity', 'clock_in', 'clock_out', 'description')
+OFF_FIELDS = ('activity', 'clock_in', 'clock_out', 'description')
+TIME_FIELDS = ('clock_in', 'clock_out')
+
+_INVALID = object()
+
+# entry is set for rows to submit; sunday marks a valid row that is skipped.
+RowResult = namedtuple('RowResult', ['date_obj', 'entry', 'errors', 'sunday'])
+
+class EntryValidator:
+    """Date and time rules shared by the CSV import and interactive input, built once per run.
+
+    Every check compares against one reference time and looks clock values up in a precomputed
+    HH:MM table, so rows are validated without re-splitting strings or re-reading the clock.
+    """
+
+    def __init__(self, now=None):
+        self.now = now or datetime.now()
+
+    @staticmethod
+    def lookup_time(value):
+        # Minutes after midnight, None for OFF, or _INVALID.
+        return TIME_MINUTES.get(value, _INVALID)
+
+    def is_valid_time(self, value):
+        return self.lookup_time(value) is not _INVALID
+
+    def parse_date(self, value):
+        # Returns (datetime, None) or (None, reason). Zero-padded YYYY-MM-DD takes the fast path;
+        # anything else goes through strptime, which also accepts dates such as 2025-3-3.
+        try:
+            if (len(value) == 10 and value[4] == '-' and value[7] == '-'
+                    and (value[:4] + value[5:7] + value[8:]).isdigit()):
+                date_obj = datetime(int(value[:4]), int(value[5:7]), int(value[8:]))
+            else:
+                date_obj = datetime.strptime(value, '%Y-%m-%d')
+        except ValueError as e:
+            return None, f"Use YYYY-MM-DD format. Error: {str(e)}"
+        if date_obj > self.now:
+            return None, "future"
+        return date_obj, None
+
+    def time_error(self, value, label):
+        if not value:
+            return f"{label} cannot be empty"
+        if not self.is_valid_time(value):
+            return f"{label} must be in format HH:MM (24-hour) or OFF"
+        return None
+
+    def clock_order_error(self, clock_in, clock_out):
+        clock_in_minutes = self.lookup_time(clock_in)
+        clock_out_minutes = self.lookup_time(clock_out)
+        if clock_in_minutes in (None, _INVALID) or clock_out_minutes in (None, _INVALID):
+            return None
+        if clock_out_minutes <= clock_in_minutes:
+            return "Clock out time must be later than clock in time"
+        return None
+
+    def validate_row(self, row_num, row):
+        # One pass over an already non-empty CSV row; every problem in the row is reported.
+        values = {field: (row.get(field) or '').strip() for field in REQUIRED_FIELDS}
+        errors = []
+
+        empty_fields = [field for field in REQUIRED_FIELDS if not values[field]]
+        if empty_fields:
+            errors.append(f"Empty required fields in row {row_num}: {', '.join(empty_fields)}")
+
+        date_obj = None
+        if values['date']:
+            date_obj, reason = self.parse_date(values['date'])
+            if reason == "future":
+                errors.append(f"Future date '{values['date']}' in row {row_num} is not allowed")
+            elif reason:
+                errors.append(f"Invalid date format '{values['date']}' in row {row_num}. {reason}")
+
+        off_count = sum(1 for field in OFF_FIELDS if values[field] == OFF_VALUE)
+        if 0 < off_count < len(OFF_FIELDS):
+            non_off_fields = [field for field in OFF_FIELDS if values[field] != OFF_VALUE]
+            errors.append(
+                f"Inconsistent OFF values in row {row_num}. When any field is 'OFF', all fields "
+                f"(activity, clock_in, clock_out, description) must be 'OFF'. Fields not set to 'OFF': "
+                f"{', '.join(non_off_fields)}"
+            )
+        elif not errors and date_obj.weekday() == WEEKDAY_SUNDAY:
+            return RowResult(date_obj, None, [], True)
+
+        minutes = {}
+        for field in TIME_FIELDS:
+            value = values[field]
+            if value and value != OFF_VALUE:
+                minutes[field] = self.lookup_time(value)
+                if minutes[field] is _INVALID:
+                    errors.append(
+                        f"Invalid time format '{value}' in row {row_num}, column {field}. "
+                        f"Use HH:MM format (24-hour) or OFF."
+                    )
+
+        clock_in_minutes = minutes.get('clock_in', _INVALID)
+        clock_out_minutes = minutes.get('clock_out', _INVALID)
+        if _INVALID not in (clock_in_minutes, clock_out_minutes) and clock_out_minutes <= clock_in_minutes:
+            errors.append(
+                f"Error in row {row_num}: Clock out time ({values['clock_out']}) must be later "
+                f"than clock in time ({values['clock_in']})"
+            )
+
+        if errors:
+            return RowResult(date_obj, None, errors, False)
+
+        entry = LogEntry(
+            date_obj, values['activity'], values['clock_in'], values['clock_out'], values['description']
+        )
+        return RowResult(date_obj, entry, [], False)
+
+_validator = None
+
+def get_validator():
+    # One validator per run, so every row is checked against the same reference time.
+    global _validator
+    if _validator is None:
+        _validator = EntryValidator()
+    return _validator